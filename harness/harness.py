@@ -295,10 +295,14 @@ def write_json(path: str, payload: dict) -> None:
         json.dump(payload, handle, indent=2, sort_keys=True)
 
 
-def _line_matches_owner(line: str, owner_type: str, owner_id: str) -> bool:
+# Bound once for the per-line timeline scan below.
+_JSON_DECODE = json.JSONDecoder().decode
+
+
+def _line_matches_owner(line: bytes, owner_type: str, owner_id: str) -> bool:
     try:
-        event = json.loads(line)
-    except json.JSONDecodeError:
+        event = _JSON_DECODE(line.decode("utf-8-sig"))
+    except ValueError:
         return False
     if not isinstance(event, dict):
         return False
@@ -307,21 +311,37 @@ def _line_matches_owner(line: str, owner_type: str, owner_id: str) -> bool:
     return event.get("job_id") == owner_id
 
 
+# Owned lines contain the id verbatim unless JSON had to escape it, so lines
+# without it can be rejected before the far more expensive json.loads.
+def _owner_probe(owner_id: str) -> bytes | None:
+    if not owner_id or not owner_id.isascii() or not owner_id.isprintable():
+        return None
+    if '"' in owner_id or "\\" in owner_id:
+        return None
+    return owner_id.encode("ascii")
+
+
 def materialize_filtered_timeline_copy(owner_type: str, owner_id: str, output_path: str) -> int:
     ensure_dir(os.path.dirname(output_path))
     tmp_path = f"{output_path}.tmp"
     matched = 0
+    probe = _owner_probe(owner_id)
     with TIMELINE_COPY_LOCK:
-        with open(tmp_path, "w", encoding="utf-8") as writer:
+        with open(tmp_path, "wb") as writer:
             if os.path.isfile(TIMELINE_PATH):
-                with open(TIMELINE_PATH, "r", encoding="utf-8", errors="replace") as reader:
-                    for raw in reader:
-                        line = raw.strip()
-                        if not line:
+                # Bytes in, bytes out: no per-line decode, and only copied lines get stripped.
+                with open(TIMELINE_PATH, "rb") as reader:
+                    for line in reader:
+                        if line.isspace():
+                            continue
+                        if probe is not None and probe not in line:
                             continue
+                        if not line.isascii():
+                            # Keep the old errors="replace" reading of invalid UTF-8.
+                            line = line.decode("utf-8", errors="replace").encode("utf-8")
                         if not _line_matches_owner(line, owner_type, owner_id):
                             continue
-                        writer.write(line + "\n")
+                        writer.write(line.strip() + b"\n")
                         matched += 1
         os.replace(tmp_path, output_path)
     return matched
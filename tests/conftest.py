@@ -5,6 +5,7 @@ Shared pytest utilities for the full test suite.
 
 This module:
 - registers shared pytest plugins used across test layers,
+- puts `collector/scripts` on `sys.path` so collector scripts import normally,
 - provides helpers to read/parse JSON and JSONL test artifacts,
 - loads session/job ownership metadata from harness log outputs, and
 - exposes a single timeline validator fixture used by integration,
@@ -12,6 +13,7 @@ This module:
 """
 
 import json
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -21,6 +23,12 @@ pytest_plugins = ["tests.support.pytest_docker"]
 
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
+COLLECTOR_SCRIPTS_DIR = ROOT_DIR / "collector" / "scripts"
+
+# Make collector scripts importable as plain modules so unit tests share
+# `sys.modules` and the normal `__pycache__` bytecode cache.
+if str(COLLECTOR_SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(COLLECTOR_SCRIPTS_DIR))
 
 
 def parse_ts(value: str | None) -> tuple[int, int]:
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import ROOT_DIR
+
+
+pytestmark = pytest.mark.unit
+
+
+HARNESS_PATH = ROOT_DIR / "harness" / "harness.py"
+
+
+def _load_harness_module():
+    spec = importlib.util.spec_from_file_location("harness_module_for_tests", HARNESS_PATH)
+    if spec is None or spec.loader is None:
+        raise AssertionError(f"Failed to load harness module from {HARNESS_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_filtered_timeline_copy_prefilters_without_changing_matches(tmp_path: Path, monkeypatch) -> None:
+    """Owner copies keep exactly the rows whose parsed owner id matches, including escaped ids."""
+    harness = _load_harness_module()
+    timeline = tmp_path / "filtered_timeline.jsonl"
+    rows = [
+        {"job_id": "job_1", "event_type": "exec"},
+        {"job_id": "job_10", "event_type": "exec"},
+        {"session_id": "job_1", "event_type": "exec"},
+        {"job_id": "jöb", "event_type": "exec"},
+        {"job_id": "job_1", "event_type": "fs_create", "details": {"path": "/a"}},
+    ]
+    timeline.write_text(
+        "".join(json.dumps(row) + "\n" for row in rows) + "not json job_1\n",
+        encoding="utf-8",
+    )
+    with timeline.open("ab") as handle:
+        handle.write(b'  {"job_id": "job_1", "details": {"cmd": "caf\xe9"}}\r\n\n   \n')
+    monkeypatch.setattr(harness, "TIMELINE_PATH", str(timeline))
+
+    output = tmp_path / "copy" / "job_1.jsonl"
+    assert harness.materialize_filtered_timeline_copy("job", "job_1", str(output)) == 3
+    assert [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()] == [
+        rows[0],
+        rows[4],
+        {"job_id": "job_1", "details": {"cmd": "caf\ufffd"}},
+    ]
+
+    assert harness.materialize_filtered_timeline_copy("job", "jöb", str(output)) == 1
+    assert harness.materialize_filtered_timeline_copy("session", "job_1", str(output)) == 1
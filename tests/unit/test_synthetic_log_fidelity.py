@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import importlib.util
 import json
-import shlex
+import mmap
+import re
 from pathlib import Path
 
+import filter_audit_logs
 import pytest
 
+from tests.conftest import ROOT_DIR
 from tests.support.synthetic_logs import (
     make_dns_query_event,
     make_dns_response_event,
@@ -20,72 +22,66 @@ from tests.support.synthetic_logs import (
 pytestmark = pytest.mark.unit
 
 
-ROOT_DIR = Path(__file__).resolve().parents[2]
 EXAMPLE_LOG_ROOT = ROOT_DIR / "example_logs"
 ACTIVE_RUN_PATH = EXAMPLE_LOG_ROOT / ".active_run.json"
-AUDIT_FILTER_SCRIPT = ROOT_DIR / "collector" / "scripts" / "filter_audit_logs.py"
 
-def _example_run_root() -> Path:
+_AUDIT_KV_RE = re.compile(r"(?:^|\s)([A-Za-z0-9_]+)=")
+_EXEC_SYSCALL_LINE_RE = re.compile(rb'^type=SYSCALL [^\n]*key="exec"[^\n]*', re.MULTILINE)
+
+REQUIRED_SYSCALL_KEYS = frozenset(
+    {
+        "type",
+        "msg",
+        "arch",
+        "syscall",
+        "success",
+        "exit",
+        "pid",
+        "ppid",
+        "uid",
+        "gid",
+        "comm",
+        "exe",
+        "key",
+    }
+)
+
+
+def _example_run_root() -> Path | None:
     try:
         meta = json.loads(ACTIVE_RUN_PATH.read_text(encoding="utf-8"))
-    except FileNotFoundError as exc:
-        raise AssertionError(f"Missing example log root selector: {ACTIVE_RUN_PATH}") from exc
+    except FileNotFoundError:
+        return None
     except json.JSONDecodeError as exc:
         raise AssertionError(f"Invalid JSON in {ACTIVE_RUN_PATH}") from exc
     run_id = meta.get("run_id")
     if not isinstance(run_id, str) or not run_id.strip():
         raise AssertionError(f"Missing run_id in {ACTIVE_RUN_PATH}")
-
-    run_root = EXAMPLE_LOG_ROOT / run_id
-    if not run_root.exists():
-        raise AssertionError(f"Active run directory does not exist: {run_root}")
-    return run_root
+    return EXAMPLE_LOG_ROOT / run_id
 
 
-def _example_audit_path() -> Path:
-    return _example_run_root() / "collector" / "raw" / "audit.log"
+EXAMPLE_RUN_ROOT = _example_run_root()
+EXAMPLE_AUDIT = EXAMPLE_RUN_ROOT / "collector" / "raw" / "audit.log" if EXAMPLE_RUN_ROOT else None
+EXAMPLE_EBPF = EXAMPLE_RUN_ROOT / "collector" / "raw" / "ebpf.jsonl" if EXAMPLE_RUN_ROOT else None
 
+if EXAMPLE_AUDIT is None or not EXAMPLE_AUDIT.exists() or not EXAMPLE_EBPF.exists():
+    pytest.skip("example logs not available", allow_module_level=True)
 
-def _example_ebpf_path() -> Path:
-    return _example_run_root() / "collector" / "raw" / "ebpf.jsonl"
 
-
-def _load_audit_filter_module():
-    spec = importlib.util.spec_from_file_location("filter_audit_logs", AUDIT_FILTER_SCRIPT)
-    if spec is None or spec.loader is None:
-        raise AssertionError(f"Unable to load module from {AUDIT_FILTER_SCRIPT}")
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
-
-
-def _parse_audit_kv_line(line: str) -> dict[str, str]:
-    fields: dict[str, str] = {}
-    for token in shlex.split(line, posix=True):
-        if "=" not in token:
-            continue
-        key, value = token.split("=", 1)
-        fields[key] = value
-    return fields
+def _audit_field_keys(line: str) -> set[str]:
+    return {match.group(1) for match in _AUDIT_KV_RE.finditer(line)}
 
 
 def _first_real_audit_syscall_line() -> str:
-    audit_path = _example_audit_path()
-    for line in audit_path.read_text(encoding="utf-8", errors="replace").splitlines():
-        if line.startswith("type=SYSCALL") and 'key="exec"' in line:
-            return line
-    raise AssertionError(f"No exec SYSCALL line found in audit log: {audit_path}")
+    with EXAMPLE_AUDIT.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        match = _EXEC_SYSCALL_LINE_RE.search(mm)
+        if match is None:
+            raise AssertionError(f"No exec SYSCALL line found in audit log: {EXAMPLE_AUDIT}")
+        return match.group(0).decode("utf-8", errors="replace")
 
 
 def _real_ebpf_events() -> list[dict]:
-    events: list[dict] = []
-    ebpf_path = _example_ebpf_path()
-    for line in ebpf_path.read_text(encoding="utf-8", errors="replace").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        events.append(json.loads(line))
-    return events
+    return [json.loads(line) for line in EXAMPLE_EBPF.read_bytes().split(b"\n") if line.strip()]
 
 
 def _first_real_event_of_type(events: list[dict], event_type: str) -> dict:
@@ -93,14 +89,13 @@ def _first_real_event_of_type(events: list[dict], event_type: str) -> dict:
         if event.get("event_type") == event_type:
             return event
     raise AssertionError(
-        f"No event_type={event_type} found in example eBPF log: {_example_ebpf_path()}"
+        f"No event_type={event_type} found in example eBPF log: {EXAMPLE_EBPF}"
     )
 
 
 def test_synthetic_exec_syscall_contains_realistic_core_fields() -> None:
     """Synthetic SYSCALL lines include collector-relevant fields also present in real audit output."""
-    real_line = _first_real_audit_syscall_line()
-    real_fields = _parse_audit_kv_line(real_line)
+    real_keys = _audit_field_keys(_first_real_audit_syscall_line())
 
     synthetic_line = make_syscall(
         ts="1769030400.100",
@@ -111,33 +106,18 @@ def test_synthetic_exec_syscall_contains_realistic_core_fields() -> None:
         comm="bash",
         exe="/usr/bin/bash",
     )
-    synthetic_fields = _parse_audit_kv_line(synthetic_line)
+    synthetic_keys = _audit_field_keys(synthetic_line)
 
-    required = {
-        "type",
-        "msg",
-        "arch",
-        "syscall",
-        "success",
-        "exit",
-        "pid",
-        "ppid",
-        "uid",
-        "gid",
-        "comm",
-        "exe",
-        "key",
-    }
-
-    assert required.issubset(real_fields), f"Real sample missing expected keys: {required - set(real_fields)}"
-    assert required.issubset(synthetic_fields), (
-        f"Synthetic line missing expected keys: {required - set(synthetic_fields)}"
+    assert REQUIRED_SYSCALL_KEYS <= real_keys, (
+        f"Real sample missing expected keys: {REQUIRED_SYSCALL_KEYS - real_keys}"
+    )
+    assert REQUIRED_SYSCALL_KEYS <= synthetic_keys, (
+        f"Synthetic line missing expected keys: {REQUIRED_SYSCALL_KEYS - synthetic_keys}"
     )
 
 
 def test_synthetic_audit_line_parses_through_real_audit_filter_parser() -> None:
     """Synthetic SYSCALL format is accepted by the real audit parser path."""
-    module = _load_audit_filter_module()
     synthetic_line = make_syscall(
         ts="1769030400.100",
         seq=200,
@@ -147,7 +127,7 @@ def test_synthetic_audit_line_parses_through_real_audit_filter_parser() -> None:
         comm="bash",
         exe="/usr/bin/bash",
     )
-    parsed = module.parse_line(synthetic_line)
+    parsed = filter_audit_logs.parse_line(synthetic_line)
     assert parsed is not None, f"parse_line rejected synthetic syscall: {synthetic_line}"
     assert parsed.get("type") == "SYSCALL"
     assert parsed.get("seq") == 200
@@ -13,67 +13,64 @@ pytestmark = pytest.mark.unit
 
 def _write(path: Path, payload: dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload), encoding="utf-8")
+    path.write_bytes(json.dumps(payload).encode("utf-8"))
 
 
-def test_timeline_validator_accepts_valid_minimal_job_owned_timeline(tmp_path: Path) -> None:
-    """Validator accepts timeline rows with valid job ownership and metadata references."""
+@pytest.fixture
+def make_row():
+    """Returns a builder for minimal valid timeline rows; keyword overrides replace defaults."""
+
+    def _make_row(ts: str, **overrides) -> dict:
+        row = {
+            "schema_version": "timeline.filtered.v1",
+            "session_id": "unknown",
+            "ts": ts,
+            "source": "audit",
+            "event_type": "exec",
+            "details": {"cmd": "pwd"},
+        }
+        row.update(overrides)
+        return row
+
+    return _make_row
+
+
+@pytest.fixture
+def timeline_dir(tmp_path: Path):
+    """Creates a log root with valid `job_1` metadata and returns it with a timeline writer."""
     log_root = tmp_path / "logs"
-    _write(
-        log_root / "harness" / "jobs" / "job_1" / "input.json",
-        {"job_id": "job_1", "root_pid": 100, "root_sid": 200},
-    )
-    _write(
-        log_root / "harness" / "jobs" / "job_1" / "status.json",
-        {"job_id": "job_1", "root_pid": 100, "root_sid": 200},
-    )
+    job_meta = {"job_id": "job_1", "root_pid": 100, "root_sid": 200}
+    _write(log_root / "harness" / "jobs" / "job_1" / "input.json", job_meta)
+    _write(log_root / "harness" / "jobs" / "job_1" / "status.json", job_meta)
     timeline = log_root / "collector" / "filtered" / "filtered_timeline.jsonl"
     timeline.parent.mkdir(parents=True, exist_ok=True)
-    timeline.write_text(
-        json.dumps(
-            {
-                "schema_version": "timeline.filtered.v1",
-                "session_id": "unknown",
-                "job_id": "job_1",
-                "ts": "2026-01-22T00:00:01.000Z",
-                "source": "audit",
-                "event_type": "exec",
-                "details": {"cmd": "pwd"},
-            }
-        )
-        + "\n",
-        encoding="utf-8",
-    )
+
+    def _write_timeline(*rows: dict) -> Path:
+        timeline.write_bytes(b"".join(json.dumps(row).encode("utf-8") + b"\n" for row in rows))
+        return timeline
+
+    return log_root, _write_timeline
+
+
+def test_timeline_validator_accepts_valid_minimal_job_owned_timeline(timeline_dir, make_row) -> None:
+    """Validator accepts timeline rows with valid job ownership and metadata references."""
+    log_root, write_timeline = timeline_dir
+    timeline = write_timeline(make_row("2026-01-22T00:00:01.000Z", job_id="job_1"))
 
     rows = validate_timeline_outputs(log_root=log_root, timeline_path=timeline)
     assert len(rows) == 1
 
 
-def test_timeline_validator_rejects_missing_owner(tmp_path: Path) -> None:
+def test_timeline_validator_rejects_missing_owner(timeline_dir, make_row) -> None:
     """Validator rejects rows that do not provide a valid ownership shape."""
-    log_root = tmp_path / "logs"
-    timeline = log_root / "collector" / "filtered" / "filtered_timeline.jsonl"
-    timeline.parent.mkdir(parents=True, exist_ok=True)
-    timeline.write_text(
-        json.dumps(
-            {
-                "schema_version": "timeline.filtered.v1",
-                "session_id": "unknown",
-                "ts": "2026-01-22T00:00:01.000Z",
-                "source": "audit",
-                "event_type": "exec",
-                "details": {"cmd": "pwd"},
-            }
-        )
-        + "\n",
-        encoding="utf-8",
-    )
+    log_root, write_timeline = timeline_dir
+    timeline = write_timeline(make_row("2026-01-22T00:00:01.000Z"))
 
     with pytest.raises(AssertionError, match="unknown session without job owner"):
         validate_timeline_outputs(log_root=log_root, timeline_path=timeline)
 
 
-def test_timeline_validator_rejects_missing_job_root_sid(tmp_path: Path) -> None:
+def test_timeline_validator_rejects_missing_job_root_sid(tmp_path: Path, make_row) -> None:
     """Validator rejects job-owned rows when job metadata lacks integer root_sid."""
     log_root = tmp_path / "logs"
     _write(
@@ -86,20 +83,8 @@ def test_timeline_validator_rejects_missing_job_root_sid(tmp_path: Path) -> None
     )
     timeline = log_root / "collector" / "filtered" / "filtered_timeline.jsonl"
     timeline.parent.mkdir(parents=True, exist_ok=True)
-    timeline.write_text(
-        json.dumps(
-            {
-                "schema_version": "timeline.filtered.v1",
-                "session_id": "unknown",
-                "job_id": "job_1",
-                "ts": "2026-01-22T00:00:01.000Z",
-                "source": "audit",
-                "event_type": "exec",
-                "details": {"cmd": "pwd"},
-            }
-        )
-        + "\n",
-        encoding="utf-8",
+    timeline.write_bytes(
+        json.dumps(make_row("2026-01-22T00:00:01.000Z", job_id="job_1")).encode("utf-8") + b"\n"
     )
 
     with pytest.raises(AssertionError, match="missing integer root_sid"):
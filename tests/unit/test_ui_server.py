@@ -0,0 +1,920 @@
+from __future__ import annotations
+
+import gzip
+import http.client
+import importlib.util
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import pytest
+
+from tests.conftest import ROOT_DIR
+
+
+pytestmark = pytest.mark.unit
+
+
+UI_SERVER_PATH = ROOT_DIR / "ui" / "server.py"
+RUN_ID = "lux__2026_01_22_00_00_00"
+
+
+def _load_ui_server_module():
+    spec = importlib.util.spec_from_file_location("ui_server_for_tests", UI_SERVER_PATH)
+    if spec is None or spec.loader is None:
+        raise AssertionError(f"Failed to load ui server module from {UI_SERVER_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def ui_server(tmp_path: Path, monkeypatch):
+    """Fresh ui/server.py module whose log root points at an empty temp directory."""
+    module = _load_ui_server_module()
+    monkeypatch.setattr(module, "LOG_ROOT", tmp_path / "logs")
+    monkeypatch.setattr(module, "LOG_ROOT_RW", tmp_path / "logs")
+    monkeypatch.setattr(module, "ACTIVE_RUN_STATE_PATH", tmp_path / "state" / ".active_run.json")
+    return module
+
+
+@pytest.fixture
+def ui_http(ui_server):
+    """Serves the UI handler on an ephemeral localhost port; yields a request helper."""
+    server = ui_server.ThreadingHTTPServer(("127.0.0.1", 0), ui_server.UIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def _request(method: str, path: str, headers: dict | None = None, body: bytes | None = None):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, {key.lower(): value for key, value in response.getheaders()}, response.read()
+        finally:
+            conn.close()
+
+    _request.server_address = server.server_address
+    try:
+        yield _request
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=10)
+
+
+def _row(ts: str, **overrides) -> dict:
+    row = {
+        "schema_version": "timeline.filtered.v1",
+        "session_id": "session_1",
+        "ts": ts,
+        "source": "audit",
+        "event_type": "exec",
+        "details": {"cmd": "pwd"},
+    }
+    row.update(overrides)
+    return row
+
+
+def _timeline_path(ui_server) -> Path:
+    path = ui_server.timeline_path_for_run(RUN_ID)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _write_rows(path: Path, rows: list[dict], mode: str = "w") -> None:
+    with path.open(mode, encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+
+def test_timeline_rows_apply_filters_limit_and_counts(ui_server) -> None:
+    """Filtered timeline queries keep the newest `limit` rows and count every match."""
+    timeline = _timeline_path(ui_server)
+    _write_rows(
+        timeline,
+        [
+            _row("2026-01-22T00:00:01.000Z"),
+            _row("2026-01-22T00:00:02.000Z", event_type="fs_create", details={"path": "/a"}),
+            _row("2026-01-22T00:00:03.000Z", session_id="session_2"),
+            _row("2026-01-22T00:00:04.5Z"),
+        ],
+    )
+
+    rows, counts, run_id = ui_server.iter_timeline_rows(
+        {"run_id": [RUN_ID], "session_id": ["session_1"], "limit": ["2"]}
+    )
+    assert run_id == RUN_ID
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:02.000Z", "2026-01-22T00:00:04.5Z"]
+    assert counts == {"exec": 2, "fs_create": 1}
+
+    rows, counts, _ = ui_server.iter_timeline_rows(
+        {"run_id": [RUN_ID], "start": ["2026-01-22T00:00:02Z"], "end": ["2026-01-22T00:00:04.5Z"]}
+    )
+    assert [row["ts"] for row in rows] == [
+        "2026-01-22T00:00:02.000Z",
+        "2026-01-22T00:00:03.000Z",
+        "2026-01-22T00:00:04.5Z",
+    ]
+    assert counts == {"fs_create": 1, "exec": 2}
+
+    rows, counts, _ = ui_server.iter_timeline_rows(
+        {"run_id": [RUN_ID], "start": ["2026-01-22T00:00:03Z"], "limit": ["99999999999999999999"]}
+    )
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:03.000Z", "2026-01-22T00:00:04.5Z"]
+    assert counts == {"exec": 2}
+
+
+def test_timeline_cache_follows_file_creation_and_removal(ui_server) -> None:
+    """A missing timeline reads as empty, and the cache resets if the file disappears again."""
+    timeline = _timeline_path(ui_server)
+    timeline.unlink(missing_ok=True)
+    assert ui_server.iter_timeline_rows({"run_id": [RUN_ID]}) == ([], {}, RUN_ID)
+
+    _write_rows(timeline, [_row("2026-01-22T00:00:01Z")])
+    rows, counts, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert len(rows) == 1 and counts == {"exec": 1}
+
+    timeline.unlink()
+    assert ui_server.iter_timeline_rows({"run_id": [RUN_ID]}) == ([], {}, RUN_ID)
+
+
+def test_timeline_entity_filters_use_session_and_job_index(ui_server) -> None:
+    """Session/job filters match the full scan, including rows appended or rewritten later."""
+    timeline = _timeline_path(ui_server)
+    rows = [
+        _row("2026-01-22T00:00:01Z", session_id=None, job_id="job_1"),
+        _row("2026-01-22T00:00:02Z", job_id="job_1"),
+        _row("2026-01-22T00:00:03Z", session_id="session_2"),
+        _row("2026-01-22T00:00:04Z", job_id="job_2"),
+    ]
+    _write_rows(timeline, rows)
+
+    def query(**filters) -> list[str]:
+        result, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID], **{k: [v] for k, v in filters.items()}})
+        return [row["ts"] for row in result]
+
+    assert query(job_id="job_1") == ["2026-01-22T00:00:01Z", "2026-01-22T00:00:02Z"]
+    assert query(session_id="session_1", job_id="job_1") == ["2026-01-22T00:00:02Z"]
+    assert query(session_id="session_1", limit="1") == ["2026-01-22T00:00:04Z"]
+    assert query(session_id="missing") == []
+    cache = ui_server.timeline_cache_for(timeline)
+    assert {job_id: list(positions) for job_id, positions in cache.by_job.items()} == {"job_1": [0, 1], "job_2": [3]}
+
+    _write_rows(timeline, [_row("2026-01-22T00:00:05Z", job_id="job_1")], mode="a")
+    assert query(job_id="job_1", start="2026-01-22T00:00:02Z") == ["2026-01-22T00:00:02Z", "2026-01-22T00:00:05Z"]
+
+    _write_rows(timeline, [_row("2026-01-22T00:00:09Z", session_id="session_2")])
+    assert query(session_id="session_2") == ["2026-01-22T00:00:09Z"]
+    assert query(job_id="job_1") == []
+
+
+def test_timeline_filter_combinations_match_reference_scan(ui_server) -> None:
+    """Every combination of filters returns what a plain per-row check would."""
+    timeline = _timeline_path(ui_server)
+    rows = [
+        _row(
+            f"2026-01-22T00:00:{second:02d}Z",
+            session_id=f"session_{second % 3}",
+            job_id=f"job_{second % 2}",
+            source=("audit", "ebpf", "proxy")[second % 3],
+            event_type=("exec", "fs_create", "net_connect", "exec")[second % 4],
+        )
+        for second in range(24)
+    ]
+    _write_rows(timeline, rows)
+    options = {
+        "session_id": [None, "session_1"],
+        "job_id": [None, "job_0"],
+        "source": [None, "audit,ebpf"],
+        "event_type": [None, "exec"],
+        "start": [None, "2026-01-22T00:00:05Z"],
+        "end": [None, "2026-01-22T00:00:17Z"],
+    }
+
+    def expected(selected: dict) -> list[dict]:
+        kept = []
+        for row in rows:
+            if selected.get("session_id") and row["session_id"] != selected["session_id"]:
+                continue
+            if selected.get("job_id") and row["job_id"] != selected["job_id"]:
+                continue
+            if selected.get("source") and row["source"] not in selected["source"].split(","):
+                continue
+            if selected.get("event_type") and row["event_type"] != selected["event_type"]:
+                continue
+            if selected.get("start") and row["ts"] < selected["start"]:
+                continue
+            if selected.get("end") and row["ts"] > selected["end"]:
+                continue
+            kept.append(row)
+        return kept
+
+    for mask in range(2 ** len(options)):
+        selected = {
+            name: values[1] for bit, (name, values) in enumerate(options.items()) if mask & (1 << bit)
+        }
+        result, counts, _ = ui_server.iter_timeline_rows(
+            {"run_id": [RUN_ID], **{name: [value] for name, value in selected.items()}}
+        )
+        reference = expected(selected)
+        assert result == reference, selected
+        assert sum(counts.values()) == len(reference), selected
+
+        limited, limited_counts, _ = ui_server.iter_timeline_rows(
+            {"run_id": [RUN_ID], "limit": ["2"], **{name: [value] for name, value in selected.items()}}
+        )
+        assert limited == reference[-2:], selected
+        assert limited_counts == counts, selected
+
+        no_rows, only_counts, _ = ui_server.iter_timeline_rows(
+            {"run_id": [RUN_ID], "limit": ["2"], **{name: [value] for name, value in selected.items()}},
+            only_counts=True,
+        )
+        assert no_rows == [], selected
+        assert only_counts == counts, selected
+
+
+def test_timeline_cache_picks_up_appended_rows(ui_server) -> None:
+    """Rows appended after a query are returned by the next query without losing earlier rows."""
+    timeline = _timeline_path(ui_server)
+    _write_rows(timeline, [_row("2026-01-22T00:00:01.000Z")])
+    rows, counts, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert len(rows) == 1
+
+    _write_rows(timeline, [_row("2026-01-22T00:00:02.000Z", event_type="fs_create")], mode="a")
+    rows, counts, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:01.000Z", "2026-01-22T00:00:02.000Z"]
+    assert counts == {"exec": 1, "fs_create": 1}
+
+
+def test_timeline_cache_reparses_rewritten_prefix(ui_server) -> None:
+    """A merge rewrite that changes already-read rows is re-parsed instead of appended to."""
+    timeline = _timeline_path(ui_server)
+    _write_rows(timeline, [_row("2026-01-22T00:00:02.000Z")])
+    ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+
+    _write_rows(
+        timeline,
+        [
+            _row("2026-01-22T00:00:01.000Z", source="ebpf", event_type="net_summary"),
+            _row("2026-01-22T00:00:02.000Z"),
+        ],
+    )
+    rows, counts, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:01.000Z", "2026-01-22T00:00:02.000Z"]
+    assert counts == {"net_summary": 1, "exec": 1}
+
+
+def test_timeline_cache_waits_for_incomplete_trailing_line(ui_server) -> None:
+    """A partially written last line is skipped until the writer finishes it."""
+    timeline = _timeline_path(ui_server)
+    _write_rows(timeline, [_row("2026-01-22T00:00:01.000Z")])
+    partial = json.dumps(_row("2026-01-22T00:00:02.000Z"), separators=(",", ":"))
+    with timeline.open("a", encoding="utf-8") as handle:
+        handle.write(partial[:20])
+
+    rows, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert len(rows) == 1
+
+    with timeline.open("a", encoding="utf-8") as handle:
+        handle.write(partial[20:] + "\n")
+    rows, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:01.000Z", "2026-01-22T00:00:02.000Z"]
+
+
+# Runs in a child interpreter: reading a mapping of a truncated file dies with SIGBUS,
+# which would take the whole pytest process down rather than fail one test.
+TRUNCATE_DURING_REFRESH_SCRIPT = """
+import importlib.util, json, sys, threading
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location("ui_server_truncate", sys.argv[1])
+ui = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ui)
+timeline = Path(sys.argv[2])
+lines = [json.dumps({"ts": f"2026-01-22T00:00:{n % 60:02d}Z", "details": {"pad": "x" * 200}}) for n in range(2000)]
+body = "\\n".join(lines) + "\\n"
+timeline.write_text(body)
+cache = ui.TimelineCache()
+cache.refresh(timeline)
+
+consume = ui.TimelineCache._consume
+def truncate_then_consume(self, *args):
+    timeline.write_text("")  # the merge step's open(path, "w"): same inode, now empty
+    consume(self, *args)
+ui.TimelineCache._consume = truncate_then_consume
+with timeline.open("a") as handle:
+    handle.write(lines[0] + "\\n")
+cache.refresh(timeline)
+ui.TimelineCache._consume = consume
+
+stop = threading.Event()
+def rewrite():
+    while not stop.is_set():
+        timeline.write_text(body)
+writer = threading.Thread(target=rewrite)
+writer.start()
+try:
+    for _ in range(200):
+        cache.refresh(timeline)
+finally:
+    stop.set()
+    writer.join()
+timeline.write_text(lines[0] + "\\n")
+cache.refresh(timeline)
+print(len(cache.rows))
+"""
+
+
+def test_timeline_cache_survives_truncation_during_refresh(tmp_path: Path) -> None:
+    """The merge step truncating the file mid-refresh never crashes the process or breaks the cache."""
+    result = subprocess.run(
+        [sys.executable, "-c", TRUNCATE_DURING_REFRESH_SCRIPT, str(UI_SERVER_PATH), str(tmp_path / "timeline.jsonl")],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "1"
+
+
+@pytest.mark.parametrize("batch_bytes", [1, 100, 4 * 1024 * 1024])
+def test_timeline_cache_batch_parse_matches_line_parse(ui_server, monkeypatch, batch_bytes: int) -> None:
+    """Batched decoding yields the same rows as line-by-line parsing, whatever the batch boundaries."""
+    monkeypatch.setattr(ui_server, "TIMELINE_BATCH_BYTES", batch_bytes)
+    timeline = _timeline_path(ui_server)
+    good = [_row(f"2026-01-22T00:00:{second:02d}Z", details={"n": second}) for second in range(12)]
+    lines = [json.dumps(row) for row in good[:4]]
+    lines += ["", "   ", "not json", "[1, 2]", '{"a": 1}, {"b": 2}']
+    lines += [json.dumps(row) for row in good[4:8]]
+    timeline.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    rows, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert rows == good[:8]
+
+    _write_rows(timeline, good[8:], mode="a")
+    rows, counts, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID], "session_id": ["session_1"]})
+    assert rows == good
+    assert counts == {"exec": 12}
+
+
+def test_timeline_rows_parse_without_orjson(tmp_path: Path, monkeypatch) -> None:
+    """The stdlib JSON fallback returns the same rows when orjson is not installed."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    module = _load_ui_server_module()
+    assert module.orjson is None
+    monkeypatch.setattr(module, "LOG_ROOT", tmp_path / "logs")
+    timeline = _timeline_path(module)
+    _write_rows(timeline, [_row("2026-01-22T00:00:01.000Z", details={"cmd": "pwd", "inode": 2**70})])
+
+    rows, counts, _ = module.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert rows[0]["details"]["inode"] == 2**70
+    assert counts == {"exec": 1}
+    assert json.loads(module.json_dumps_bytes({"rows": rows})) == {"rows": rows}
+
+
+def test_json_helpers_accept_values_orjson_rejects(ui_server) -> None:
+    """Integers wider than 64 bits still round-trip through the JSON helpers."""
+    payload = {"value": 2**70}
+    assert ui_server.json_loads(json.dumps(payload).encode("utf-8")) == payload
+    assert json.loads(ui_server.json_dumps_bytes(payload)) == payload
+
+
+def test_timeline_rows_keep_lines_with_invalid_utf8(ui_server) -> None:
+    """Rows with undecodable bytes are kept with U+FFFD, as the text-mode reader did."""
+    timeline = _timeline_path(ui_server)
+    first = json.dumps(_row("2026-01-22T00:00:01Z"), separators=(",", ":")).encode("utf-8")
+    broken = json.dumps(_row("2026-01-22T00:00:02Z", details={"cmd": "caf@"}), separators=(",", ":"))
+    timeline.write_bytes(first + b"\n" + broken.encode("utf-8").replace(b"@", b"\xe9") + b"\n")
+
+    rows, counts, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:01Z", "2026-01-22T00:00:02Z"]
+    assert rows[1]["details"]["cmd"] == "caf\ufffd"
+    assert counts == {"exec": 2}
+
+
+def test_timeline_rows_skip_blank_and_invalid_lines(ui_server) -> None:
+    """Blank, CRLF-terminated, and malformed lines never break timeline parsing."""
+    timeline = _timeline_path(ui_server)
+    first = json.dumps(_row("2026-01-22T00:00:01.000Z"))
+    second = json.dumps(_row("2026-01-22T00:00:02.000Z"))
+    timeline.write_bytes(f"\n{first}\r\n   \nnot json\n{second}\n\n".encode("utf-8"))
+
+    rows, counts, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:01.000Z", "2026-01-22T00:00:02.000Z"]
+    assert counts == {"exec": 2}
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_load_jobs_reflects_in_place_status_rewrites(ui_server) -> None:
+    """Job status rewritten in place is visible even though the jobs dir mtime is unchanged."""
+    job_dir = ui_server.jobs_dir_for_run(RUN_ID) / "job_1"
+    _write_json(job_dir / "input.json", {"job_id": "job_1", "submitted_at": "2026-01-22T00:00:00Z"})
+    _write_json(job_dir / "status.json", {"job_id": "job_1", "status": "running"})
+    assert [job["status"] for job in ui_server.load_jobs(RUN_ID)] == ["running"]
+
+    _write_json(job_dir / "status.json", {"job_id": "job_1", "status": "complete", "exit_code": 0})
+    jobs = ui_server.load_jobs(RUN_ID)
+    assert [(job["status"], job["exit_code"]) for job in jobs] == [("complete", 0)]
+
+
+def test_load_jobs_rereads_only_changed_entries(ui_server, monkeypatch) -> None:
+    """After one job changes, only that job's metadata files are parsed again."""
+    jobs_dir = ui_server.jobs_dir_for_run(RUN_ID)
+    for job_id in ("job_1", "job_2", "job_3"):
+        _write_json(jobs_dir / job_id / "input.json", {"job_id": job_id, "submitted_at": job_id})
+        _write_json(jobs_dir / job_id / "status.json", {"job_id": job_id, "status": "running"})
+    assert [job["job_id"] for job in ui_server.load_jobs(RUN_ID)] == ["job_1", "job_2", "job_3"]
+
+    reads: list[str] = []
+    read_json = ui_server.read_json
+
+    def counting_read_json(path: Path):
+        if path.parent.parent == jobs_dir:
+            reads.append(f"{path.parent.name}/{path.name}")
+        return read_json(path)
+
+    monkeypatch.setattr(ui_server, "read_json", counting_read_json)
+    _write_json(jobs_dir / "job_2" / "status.json", {"job_id": "job_2", "status": "complete"})
+    ui_server.write_label(ui_server.job_labels_dir_for_run(RUN_ID), "job_3", "third")
+    ui_server.invalidate_entity_caches(jobs_dir)
+
+    jobs = ui_server.load_jobs(RUN_ID)
+    assert sorted(reads) == ["job_2/input.json", "job_2/status.json"]
+    assert [(job["status"], job.get("name")) for job in jobs] == [
+        ("running", None),
+        ("complete", None),
+        ("running", "third"),
+    ]
+
+
+def test_load_sessions_reflects_new_sessions_and_labels(ui_server) -> None:
+    """Added sessions and label renames show up on the next load."""
+    sessions_dir = ui_server.sessions_dir_for_run(RUN_ID)
+    _write_json(sessions_dir / "session_1" / "meta.json", {"session_id": "session_1", "started_at": "1"})
+    assert [item["session_id"] for item in ui_server.load_sessions(RUN_ID)] == ["session_1"]
+
+    _write_json(sessions_dir / "session_2" / "meta.json", {"session_id": "session_2", "started_at": "2"})
+    ui_server.write_label(ui_server.session_labels_dir_for_run(RUN_ID), "session_1", "first")
+    sessions = ui_server.load_sessions(RUN_ID)
+    assert [(item["session_id"], item.get("name")) for item in sessions] == [
+        ("session_1", "first"),
+        ("session_2", None),
+    ]
+
+
+def test_timeline_time_range_compares_instants_not_strings(ui_server) -> None:
+    """Range bounds compare real instants, including offsets and fractional precision."""
+    timeline = _timeline_path(ui_server)
+    _write_rows(
+        timeline,
+        [
+            _row("2026-01-22T00:00:01Z"),
+            _row("2026-01-22T00:00:01.000000001Z"),
+            _row("2026-01-22T00:00:02.25Z"),
+            _row("not-a-timestamp"),
+        ],
+    )
+
+    rows, counts, _ = ui_server.iter_timeline_rows(
+        {"run_id": [RUN_ID], "start": ["2026-01-22T00:00:01.000000001Z"], "end": ["2026-01-22T00:00:02.25Z"]}
+    )
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:01.000000001Z", "2026-01-22T00:00:02.25Z"]
+    assert counts == {"exec": 2}
+    assert "ts_ns" not in rows[0] and "_ts_ns" not in rows[0]
+
+    rows, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID], "start": ["garbage"]})
+    assert rows == []
+    assert ui_server.timestamp_ns("2026-01-22T01:00:00+01:00") == ui_server.timestamp_ns("2026-01-22T00:00:00Z")
+    assert ui_server.timestamp_ns("2026-01-22T01:00:02.25+01:00") == ui_server.timestamp_ns("2026-01-22T00:00:02.25Z")
+
+    rows, _, _ = ui_server.iter_timeline_rows(
+        {"run_id": [RUN_ID], "start": ["2026-01-22T00:00:01.5+00:00"], "end": ["2026-01-21T19:00:02.25-05:00"]}
+    )
+    assert [row["ts"] for row in rows] == ["2026-01-22T00:00:02.25Z"]
+
+
+def test_timeline_caches_keep_only_recently_used_runs(ui_server, tmp_path: Path, monkeypatch) -> None:
+    """Per-run timeline caches are bounded; the least recently used run is dropped first."""
+    monkeypatch.setattr(ui_server, "TIMELINE_CACHE_RUNS", 2)
+    active, first, second = (tmp_path / f"{name}.jsonl" for name in ("active", "first", "second"))
+
+    active_cache = ui_server.timeline_cache_for(active)
+    first_cache = ui_server.timeline_cache_for(first)
+    assert ui_server.timeline_cache_for(active) is active_cache
+    ui_server.timeline_cache_for(second)
+
+    assert list(ui_server._TIMELINE_CACHES) == [active, second]
+    assert ui_server.timeline_cache_for(active) is active_cache
+    assert ui_server.timeline_cache_for(first) is not first_cache
+
+
+def test_timeline_timestamps_are_converted_only_for_time_range_queries(ui_server) -> None:
+    """Queries without start/end never convert timestamps; range queries convert each row once."""
+    timeline = _timeline_path(ui_server)
+    _write_rows(timeline, [_row(f"2026-01-22T00:00:0{second}Z") for second in range(4)])
+    cache = ui_server.timeline_cache_for(timeline)
+
+    ui_server.iter_timeline_rows({"run_id": [RUN_ID], "session_id": ["session_1"], "source": ["audit"]})
+    assert cache.ts_ns == []
+
+    rows, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID], "start": ["2026-01-22T00:00:02Z"]})
+    assert len(rows) == 2
+    assert len(cache.ts_ns) == 4
+
+    _write_rows(timeline, [_row("2026-01-22T00:00:09Z")], mode="a")
+    rows, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID], "end": ["2026-01-22T00:00:01Z"]})
+    assert len(rows) == 2
+    assert cache.ts_ns[-1] == ui_server.timestamp_ns("2026-01-22T00:00:09Z")
+
+
+def test_timestamp_ns_shares_second_prefix_across_fractions(ui_server) -> None:
+    """Sub-second timestamps keep their nanoseconds while reusing the parsed whole second."""
+    base_ns = ui_server.timestamp_ns("2026-01-22T00:00:05Z")
+    assert ui_server.timestamp_ns("2026-01-22T00:00:05.5Z") == base_ns + 500_000_000
+    assert ui_server.timestamp_ns("2026-01-22T00:00:05.000000042Z") == base_ns + 42
+    assert ui_server.timestamp_ns("2026-01-22T00:00:05.1234567891Z") == base_ns + 123_456_789
+    assert ui_server.timestamp_ns("2026-01-22T00:00:05.xZ") is None
+    assert ui_server.timestamp_ns("") is None
+    assert ui_server._epoch_seconds.cache_info().hits >= 3
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "run_id=lux__1",
+        "source=audit&source=ebpf&event_type=exec%2Cfs_create",
+        "start=2026-01-22T00%3A00%3A01Z&end=&limit=10&flag",
+        "session_id=a+b&&job_id=%E2%9C%93",
+        "sess%69on_id=x&session_id=y%2Bz&source=a&source=b%20c",
+    ],
+)
+def test_quick_qs_matches_parse_qs(ui_server, query: str) -> None:
+    """The hand-rolled query parser returns exactly what `urllib.parse.parse_qs` would."""
+    assert ui_server.quick_qs(query) == parse_qs(query)
+
+
+def test_timeline_endpoint_streams_rows_in_slabs(ui_server, ui_http, monkeypatch) -> None:
+    """`/api/timeline` streams a body identical to the JSON payload it replaces."""
+    monkeypatch.setattr(ui_server, "STREAM_SLAB_BYTES", 256)
+    monkeypatch.setattr(ui_server, "STREAM_BATCH_ROWS", 4)
+    timeline = _timeline_path(ui_server)
+    rows = [_row(f"2026-01-22T00:00:{second:02d}.000Z") for second in range(30)]
+    _write_rows(timeline, rows)
+
+    status, headers, body = ui_http("GET", f"/api/timeline?run_id={RUN_ID}")
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    assert headers["transfer-encoding"] == "chunked"
+    assert json.loads(body) == {"run_id": RUN_ID, "rows": rows, "count": 30}
+
+    status, _, body = ui_http("GET", f"/api/timeline?run_id={RUN_ID}&session_id=missing")
+    assert status == 200
+    assert json.loads(body) == {"run_id": RUN_ID, "rows": [], "count": 0}
+
+    monkeypatch.setattr(ui_server.UIHandler, "protocol_version", "HTTP/1.0")
+    status, headers, body = ui_http("GET", f"/api/timeline?run_id={RUN_ID}&limit=3")
+    assert "transfer-encoding" not in headers
+    assert headers["connection"] == "close"
+    assert json.loads(body) == {"run_id": RUN_ID, "rows": rows[-3:], "count": 3}
+
+
+def test_static_files_send_etag_and_honor_if_none_match(ui_server, ui_http, tmp_path: Path, monkeypatch) -> None:
+    """Static assets carry an ETag; a matching If-None-Match gets a bodiless 304."""
+    build_dir = tmp_path / "build"
+    (build_dir / "assets").mkdir(parents=True)
+    (build_dir / "index.html").write_text("<html>v1</html>", encoding="utf-8")
+    (build_dir / "assets" / "app.js").write_text("console.log(1);", encoding="utf-8")
+    monkeypatch.setattr(ui_server, "BUILD_DIR", build_dir)
+
+    status, headers, body = ui_http("GET", "/assets/app.js")
+    assert status == 200
+    assert headers["content-type"] == "text/javascript"
+    assert body == b"console.log(1);"
+    etag = headers["etag"]
+
+    status, headers, body = ui_http("GET", "/assets/app.js", headers={"If-None-Match": etag})
+    assert status == 304
+    assert body == b""
+    assert headers["etag"] == etag
+
+    (build_dir / "index.html").write_text("<html>v2</html>", encoding="utf-8")
+    status, _, body = ui_http("GET", "/sessions/unknown-route")
+    assert status == 200
+    assert body == b"<html>v2</html>"
+
+
+def test_large_responses_are_gzipped_when_accepted(ui_server, ui_http, tmp_path: Path, monkeypatch) -> None:
+    """JSON, streamed timeline, and static text responses honor `Accept-Encoding: gzip`."""
+    timeline = _timeline_path(ui_server)
+    rows = [_row(f"2026-01-22T00:00:{second:02d}.000Z") for second in range(60)]
+    _write_rows(timeline, rows)
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    (build_dir / "index.html").write_text("<p>lux</p>" * 200, encoding="utf-8")
+    monkeypatch.setattr(ui_server, "BUILD_DIR", build_dir)
+    accept = {"Accept-Encoding": "br;q=1.0, gzip;q=0.5"}
+
+    _, headers, body = ui_http("GET", f"/api/timeline?run_id={RUN_ID}", headers=accept)
+    assert headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body))["count"] == 60
+
+    _, headers, body = ui_http("GET", f"/api/summary?run_id={RUN_ID}", headers=accept)
+    assert "content-encoding" not in headers  # below the compression threshold
+    assert json.loads(body)["total"] == 60
+
+    _, headers, body = ui_http("GET", "/", headers=accept)
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == b"<p>lux</p>" * 200
+
+    _, headers, body = ui_http("GET", "/", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in headers
+    assert body == b"<p>lux</p>" * 200
+
+
+def test_write_label_recreates_removed_label_dir(ui_server) -> None:
+    """Label writes are atomic and survive the label directory being removed between writes."""
+    labels_dir = ui_server.job_labels_dir_for_run(RUN_ID)
+    first = ui_server.write_label(labels_dir, "job_1", "first")
+    assert ui_server.load_label(labels_dir / "job_1.json") == first
+
+    (labels_dir / "job_1.json").unlink()
+    labels_dir.rmdir()
+    second = ui_server.write_label(labels_dir, "job_1", "second")
+    assert ui_server.load_label(labels_dir / "job_1.json") == second
+    assert sorted(path.name for path in labels_dir.iterdir()) == ["job_1.json"]
+
+
+def test_list_run_ids_only_returns_run_directories(ui_server) -> None:
+    """Run listing keeps prefixed directories and ignores stray files and other folders."""
+    assert ui_server.list_run_ids() == []
+    log_root = ui_server.LOG_ROOT
+    (log_root / "lux__2026_01_23_00_00_00").mkdir(parents=True)
+    (log_root / RUN_ID).mkdir()
+    (log_root / "lux__not_a_dir").write_text("x", encoding="utf-8")
+    (log_root / "other").mkdir()
+
+    assert ui_server.list_run_ids() == [RUN_ID, "lux__2026_01_23_00_00_00"]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (RUN_ID, True),
+        ("job_1", True),
+        ("a.b-c_D9", True),
+        ("", False),
+        ("../etc", False),
+        ("job 1", False),
+        ("job_1\n", False),
+        ("jöb", False),
+    ],
+)
+def test_is_valid_run_id(ui_server, value: str, expected: bool) -> None:
+    """Identifiers are limited to ASCII letters, digits, dot, underscore, and dash."""
+    assert ui_server.is_valid_run_id(value) is expected
+
+
+def test_large_static_files_are_sent_from_disk(ui_server, ui_http, tmp_path: Path, monkeypatch) -> None:
+    """Static files above the sendfile threshold are not cached in memory but serve identically."""
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    recording = os.urandom(ui_server.SENDFILE_MIN_BYTES * 3 + 17)
+    script = b"console.log('lux');\n" * 8000
+    (build_dir / "tui.cast").write_bytes(recording)
+    (build_dir / "bundle.js").write_bytes(script)
+    monkeypatch.setattr(ui_server, "BUILD_DIR", build_dir)
+
+    status, headers, body = ui_http("GET", "/tui.cast")
+    assert status == 200
+    assert headers["content-type"] == "application/x-asciicast"
+    assert headers["content-length"] == str(len(recording))
+    assert body == recording
+    assert ui_server.load_static(build_dir / "tui.cast").payload is None
+
+    _, headers, body = ui_http("GET", "/bundle.js")
+    assert "content-encoding" not in headers
+    assert body == script
+
+    _, headers, body = ui_http("GET", "/bundle.js", headers={"Accept-Encoding": "gzip"})
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == script
+
+
+def test_connections_are_kept_alive_across_requests(ui_server, ui_http, tmp_path: Path, monkeypatch) -> None:
+    """One HTTP/1.1 connection serves streamed, JSON, static, and rejected PATCH responses in sequence."""
+    timeline = _timeline_path(ui_server)
+    _write_rows(timeline, [_row("2026-01-22T00:00:01.000Z")])
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    (build_dir / "index.html").write_text("<html>lux</html>", encoding="utf-8")
+    monkeypatch.setattr(ui_server, "BUILD_DIR", build_dir)
+    _, port = ui_http.server_address
+
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", f"/api/timeline?run_id={RUN_ID}")
+        response = conn.getresponse()
+        assert json.loads(response.read())["count"] == 1
+        sock = conn.sock
+
+        conn.request("PATCH", f"/api/jobs/bad%20id?run_id={RUN_ID}", body=b'{"name": "x"}')
+        response = conn.getresponse()
+        assert response.status == 400
+        response.read()
+
+        conn.request("GET", f"/api/summary?run_id={RUN_ID}")
+        response = conn.getresponse()
+        assert json.loads(response.read())["total"] == 1
+
+        conn.request("GET", "/")
+        response = conn.getresponse()
+        assert response.read() == b"<html>lux</html>"
+        assert conn.sock is sock
+    finally:
+        conn.close()
+
+
+def test_rename_parses_body_and_rejects_undecodable_json(ui_server, ui_http) -> None:
+    """PATCH renames accept JSON bodies and answer 400 (not 500) for bytes that are not UTF-8 JSON."""
+    (ui_server.jobs_dir_for_run(RUN_ID) / "job_1").mkdir(parents=True)
+
+    status, _, body = ui_http("PATCH", f"/api/jobs/job_1?run_id={RUN_ID}", body=b'{"name": " build \\u00e9 "}')
+    assert status == 200
+    assert json.loads(body)["name"] == "build é"
+
+    status, _, body = ui_http("PATCH", f"/api/jobs/job_1?run_id={RUN_ID}", body=b'{"name": "\xff"}')
+    assert status == 400
+    assert json.loads(body) == {"error": "invalid json"}
+
+
+def test_timeline_body_batches_concatenate_into_one_array(ui_server, monkeypatch) -> None:
+    """Batch boundaries never leak into the body, including with the stdlib serializer fallback."""
+    monkeypatch.setattr(ui_server, "STREAM_SLAB_BYTES", 64)
+    rows = [_row(f"2026-01-22T00:00:{second:02d}Z", details={"n": second}) for second in range(10)]
+    rows[4]["details"]["n"] = 2**70
+    for batch in (3, 10, 11):
+        monkeypatch.setattr(ui_server, "STREAM_BATCH_ROWS", batch)
+        body = b"".join(ui_server.iter_timeline_body(RUN_ID, rows))
+        assert json.loads(body) == {"run_id": RUN_ID, "rows": rows, "count": 10}
+    assert json.loads(b"".join(ui_server.iter_timeline_body(None, []))) == {"run_id": None, "rows": [], "count": 0}
+
+
+def test_static_routes_fall_back_to_index_or_404(ui_server, ui_http, tmp_path: Path, monkeypatch) -> None:
+    """Directories and unknown paths serve index.html; without a build everything is a 404."""
+    build_dir = tmp_path / "build"
+    (build_dir / "assets").mkdir(parents=True)
+    monkeypatch.setattr(ui_server, "BUILD_DIR", build_dir)
+
+    status, _, body = ui_http("GET", "/")
+    assert (status, body) == (404, b"Not found")
+
+    (build_dir / "index.html").write_text("<html>lux</html>", encoding="utf-8")
+    for path in ("/", "/assets", "/jobs/job_1"):
+        status, headers, body = ui_http("GET", path)
+        assert (status, body) == (200, b"<html>lux</html>"), path
+        assert headers["content-type"] == "text/html"
+
+
+def test_static_paths_stay_inside_build_dir(ui_server, ui_http, tmp_path: Path, monkeypatch) -> None:
+    """Traversal outside the build is a 404, and every spelling of a build file shares one cache entry."""
+    build_dir = tmp_path / "build"
+    (build_dir / "assets").mkdir(parents=True)
+    (build_dir / "index.html").write_text("<html>lux</html>", encoding="utf-8")
+    (tmp_path / "secret.txt").write_text("secret", encoding="utf-8")
+    monkeypatch.setattr(ui_server, "BUILD_DIR", build_dir)
+
+    for path in ("/../secret.txt", "/assets/../../secret.txt", "/../../../../etc/hostname"):
+        status, _, body = ui_http("GET", path)
+        assert (status, body) == (404, b"Not found"), path
+
+    for path in ("/index.html", "/assets/../index.html", "/assets/../assets/../index.html", "/./index.html"):
+        status, _, body = ui_http("GET", path)
+        assert (status, body) == (200, b"<html>lux</html>"), path
+    assert list(ui_server._STATIC_CACHE) == [(build_dir / "index.html").resolve()]
+
+
+def _prefork_worker_pids(parent: int) -> set[int]:
+    return set(map(int, Path(f"/proc/{parent}/task/{parent}/children").read_text().split()))
+
+
+def test_prefork_workers_serve_requests_and_stop_on_sigterm(tmp_path: Path) -> None:
+    """Forked UI_WORKERS share the port, a killed worker is replaced, and SIGTERM stops them all."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    env = {
+        **os.environ,
+        "UI_BIND": "127.0.0.1",
+        "UI_PORT": str(port),
+        "UI_WORKERS": "2",
+        "UI_LOG_ROOT": str(tmp_path / "logs"),
+        "UI_ACTIVE_RUN_STATE_PATH": str(tmp_path / "state" / ".active_run.json"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, str(UI_SERVER_PATH)], env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+    def request_runs() -> None:
+        for _ in range(6):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            try:
+                conn.request("GET", "/api/runs")
+                response = conn.getresponse()
+                assert response.status == 200
+                assert json.loads(response.read()) == {"runs": [], "active_run_id": None}
+            finally:
+                conn.close()
+
+    try:
+        assert b"2 workers" in process.stdout.readline()
+        request_runs()
+
+        workers = _prefork_worker_pids(process.pid)
+        assert len(workers) == 2
+        crashed = min(workers)
+        os.kill(crashed, signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            replaced = _prefork_worker_pids(process.pid)
+            if len(replaced) == 2 and crashed not in replaced:
+                break
+            time.sleep(0.05)
+        assert len(replaced) == 2 and crashed not in replaced
+        request_runs()
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+        process.stdout.close()
+    assert f"ui worker {crashed} exited with status -9; restarting".encode() in process.stderr.read()
+    process.stderr.close()
+
+
+def test_filter_values_and_cached_row_fields_are_interned(ui_server) -> None:
+    """CSV filters parse to interned frozensets and cached rows share interned field strings."""
+    assert ui_server.parse_csv([" audit, ebpf ,,"]) == frozenset({"audit", "ebpf"})
+    assert ui_server.parse_csv(["audit", " proxy "]) == frozenset({"audit", "proxy"})
+    assert ui_server.parse_csv([]) == frozenset()
+
+    timeline = _timeline_path(ui_server)
+    _write_rows(timeline, [_row("2026-01-22T00:00:01Z"), _row("2026-01-22T00:00:02Z", source="ebpf")])
+    rows, _, _ = ui_server.iter_timeline_rows({"run_id": [RUN_ID]})
+    (wanted,) = ui_server.parse_csv(["".join(["ebp", "f"])])
+    assert rows[1]["source"] is wanted
+    assert rows[0]["session_id"] is rows[1]["session_id"]
+
+
+@pytest.mark.parametrize(
+    ("header", "with_zstd", "without_zstd"),
+    [
+        (None, None, None),
+        ("gzip", "gzip", "gzip"),
+        ("*", "gzip", "gzip"),
+        ("gzip;q=0, *", None, None),
+        ("zstd", "zstd", None),
+        ("gzip, deflate, br, zstd", "zstd", "gzip"),
+        ("zstd;q=0.1, gzip", "gzip", "gzip"),
+        ("zstd;q=0, *", "gzip", "gzip"),
+    ],
+)
+def test_response_encoding_negotiation(
+    ui_server, monkeypatch, header: str | None, with_zstd: str | None, without_zstd: str | None
+) -> None:
+    """zstd is chosen only when named and available; gzip otherwise, honoring q-values."""
+    monkeypatch.setattr(ui_server, "zstandard", object())
+    assert ui_server.response_encoding(header) == with_zstd
+    monkeypatch.setattr(ui_server, "zstandard", None)
+    assert ui_server.response_encoding(header) == without_zstd
+
+
+def test_timeline_and_json_responses_use_zstd_when_accepted(ui_server, ui_http) -> None:
+    """zstd-capable clients get zstd-encoded streamed and buffered JSON responses."""
+    zstandard = pytest.importorskip("zstandard")
+    timeline = _timeline_path(ui_server)
+    _write_rows(timeline, [_row(f"2026-01-22T00:00:{second:02d}Z") for second in range(60)])
+    accept = {"Accept-Encoding": "gzip, deflate, br, zstd"}
+
+    _, headers, body = ui_http("GET", f"/api/timeline?run_id={RUN_ID}", headers=accept)
+    assert headers["content-encoding"] == "zstd"
+    decoded = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    assert json.loads(decoded)["count"] == 60
+
+    jobs_dir = ui_server.jobs_dir_for_run(RUN_ID)
+    for index in range(20):
+        _write_json(jobs_dir / f"job_{index}" / "input.json", {"job_id": f"job_{index}", "prompt": "x" * 40})
+    _, headers, body = ui_http("GET", f"/api/jobs?run_id={RUN_ID}", headers=accept)
+    assert headers["content-encoding"] == "zstd"
+    assert len(json.loads(zstandard.ZstdDecompressor().decompress(body))["jobs"]) == 20
@@ -1,20 +1,52 @@
 #!/usr/bin/env python3
+import gzip
+import hashlib
 import json
 import mimetypes
 import os
-import re
+import signal
 import socket
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import compress, islice, repeat
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from urllib.parse import parse_qs, urlparse
+from stat import S_ISREG
+from typing import Callable, Iterable, Iterator, NamedTuple, Sequence
+from urllib.parse import unquote_plus, urlparse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 ROOT = Path(__file__).resolve().parent
 BUILD_DIR = ROOT / "build"
 
-mimetypes.add_type("text/javascript", ".js")
-mimetypes.add_type("text/css", ".css")
-mimetypes.add_type("image/svg+xml", ".svg")
+# Extensions emitted by the UI build; anything else falls back to the system MIME database.
+CONTENT_TYPES = {
+    ".html": "text/html",
+    ".js": "text/javascript",
+    ".css": "text/css",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".ico": "image/x-icon",
+    ".json": "application/json",
+    ".map": "application/json",
+    ".cast": "application/x-asciicast",
+}
 
 
 def detect_log_root() -> Path:
@@ -33,16 +65,48 @@ RUN_PREFIX = "lux__"
 ACTIVE_RUN_STATE_PATH = Path(
     os.getenv("UI_ACTIVE_RUN_STATE_PATH", "/state/.active_run.json")
 )
-RUN_ID_RE = re.compile(r"^[A-Za-z0-9._-]+$")
+RUN_ID_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-")
 RUNTIME_SOCKET_PATH = Path(
     os.getenv("UI_RUNTIME_CONTROL_PLANE_SOCKET", "/run/lux/runtime/control_plane.sock")
 )
 
 
+# Bound once: json.loads re-checks its kwargs and dispatches through the default decoder per call.
+_JSON_DECODE = json.JSONDecoder().decode
+
+
+def json_loads(data: bytes | str, errors: str = "strict"):
+    """
+    Decode JSON from bytes or str, preferring orjson.
+
+    `errors` applies to the UTF-8 decode on the stdlib path: timeline rows pass
+    "replace" to keep undecodable bytes as U+FFFD, as the text-mode reader did.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some valid JSON (e.g. integers wider than 64 bits).
+            pass
+    if isinstance(data, (bytes, bytearray)):
+        # orjson rejects invalid UTF-8 outright, so such input always lands here.
+        data = data.decode("utf-8-sig", errors)
+    return _JSON_DECODE(data)
+
+
+def json_dumps_bytes(payload) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass
+    return json.dumps(payload).encode("utf-8")
+
+
 def read_json(path: Path) -> dict | None:
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
+        return json_loads(path.read_bytes())
+    except (OSError, ValueError):
         return None
 
 
@@ -51,47 +115,51 @@ def now_iso() -> str:
 
 
 def is_valid_run_id(value: str) -> bool:
-    return bool(RUN_ID_RE.fullmatch(value))
+    return bool(value) and RUN_ID_CHARS.issuperset(value)
 
 
 def list_run_ids() -> list[str]:
-    if not LOG_ROOT.exists():
+    try:
+        with os.scandir(LOG_ROOT) as it:
+            run_ids = [entry.name for entry in it if entry.name.startswith(RUN_PREFIX) and entry.is_dir()]
+    except FileNotFoundError:
         return []
-    run_ids: list[str] = []
-    for entry in LOG_ROOT.iterdir():
-        if not entry.is_dir():
-            continue
-        name = entry.name
-        if name.startswith(RUN_PREFIX):
-            run_ids.append(name)
     run_ids.sort()
     return run_ids
 
 
+# Run paths are rebuilt on every request otherwise; run ids are validated, so the key space is small.
+@lru_cache(maxsize=128)
 def run_root(run_id: str) -> Path:
     return LOG_ROOT / run_id
 
 
+@lru_cache(maxsize=128)
 def run_root_rw(run_id: str) -> Path:
     return LOG_ROOT_RW / run_id
 
 
+@lru_cache(maxsize=128)
 def timeline_path_for_run(run_id: str) -> Path:
     return run_root(run_id) / "collector" / "filtered" / "filtered_timeline.jsonl"
 
 
+@lru_cache(maxsize=128)
 def sessions_dir_for_run(run_id: str) -> Path:
     return run_root(run_id) / "harness" / "sessions"
 
 
+@lru_cache(maxsize=128)
 def jobs_dir_for_run(run_id: str) -> Path:
     return run_root(run_id) / "harness" / "jobs"
 
 
+@lru_cache(maxsize=128)
 def session_labels_dir_for_run(run_id: str) -> Path:
     return run_root_rw(run_id) / "harness" / "labels" / "sessions"
 
 
+@lru_cache(maxsize=128)
 def job_labels_dir_for_run(run_id: str) -> Path:
     return run_root_rw(run_id) / "harness" / "labels" / "jobs"
 
@@ -134,37 +202,193 @@ def load_label(path: Path) -> dict | None:
     return {"name": name.strip(), "updated_at": data.get("updated_at")}
 
 
+_LABEL_DIRS_CREATED: set[Path] = set()
+
+
+def _open_label_tmp(dir_path: Path, tmp_path: Path) -> int:
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    if dir_path not in _LABEL_DIRS_CREATED:
+        dir_path.mkdir(parents=True, exist_ok=True)
+        _LABEL_DIRS_CREATED.add(dir_path)
+    try:
+        return os.open(tmp_path, flags, 0o644)
+    except FileNotFoundError:
+        # Directory was removed after we first created it.
+        dir_path.mkdir(parents=True, exist_ok=True)
+        return os.open(tmp_path, flags, 0o644)
+
+
 def write_label(dir_path: Path, run_id: str, name: str) -> dict:
-    dir_path.mkdir(parents=True, exist_ok=True)
     payload = {"name": name, "updated_at": now_iso()}
+    data = (json.dumps(payload, indent=2, sort_keys=True) + "\n").encode("utf-8")
     tmp_path = dir_path / f".{run_id}.json.tmp"
     final_path = dir_path / f"{run_id}.json"
-    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    fd = _open_label_tmp(dir_path, tmp_path)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
     os.replace(tmp_path, final_path)
     return payload
 
 
-def normalize_ts(ts: str | None) -> str | None:
+_NS_PAD = "000000000"
+
+
+def _split_ts(ts: str) -> tuple[str, str]:
+    """Split into (seconds prefix incl. any UTC offset, 9-digit fraction)."""
+    base, _, frac = ts.rstrip("Z").partition(".")
+    if not frac.isdigit():
+        # A `±HH:MM` offset after the fraction belongs with the seconds prefix.
+        cut = len(frac) - len(frac.lstrip("0123456789"))
+        base, frac = base + frac[cut:], frac[:cut]
+    return base, (frac + _NS_PAD)[:9]
+
+
+@lru_cache(maxsize=4096)
+def _epoch_seconds(base: str) -> int | None:
+    # Keyed on the whole-second prefix: consecutive events mostly share it,
+    # whereas full nanosecond timestamps almost never repeat.
+    try:
+        moment = datetime.fromisoformat(base)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def timestamp_ns(ts: str | None) -> int | None:
+    """Convert a timeline timestamp to integer nanoseconds since the epoch (UTC)."""
     if not ts:
         return None
-    value = ts.rstrip("Z")
-    if "." in value:
-        base, frac = value.split(".", 1)
-        frac = (frac + "000000000")[:9]
-    else:
-        base = value
-        frac = "000000000"
-    return f"{base}.{frac}Z"
+    base, frac = _split_ts(ts)
+    seconds = _epoch_seconds(base)
+    if seconds is None:
+        return None
+    try:
+        nanos = int(frac)
+    except ValueError:
+        return None
+    return seconds * 1_000_000_000 + nanos
 
 
-def parse_csv(values: list[str]) -> set[str]:
+def parse_csv(values: list[str]) -> frozenset[str]:
     if not values:
-        return set()
+        return frozenset()
     if len(values) == 1:
         parts = values[0].split(",")
     else:
         parts = values
-    return {part.strip() for part in parts if part.strip()}
+    # Interned to match the interned row fields, so set lookups usually hit on identity.
+    return frozenset(sys.intern(part) for part in map(str.strip, parts) if part)
+
+
+# Shared pool for fanning out small metadata reads; created once so requests
+# don't pay thread startup.
+_IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="ui-io")
+
+
+class EntityCache(NamedTuple):
+    key: tuple | None
+    items: list[dict]
+    # entry name -> (stat of its metadata files, payload parsed from them)
+    parsed: dict[str, tuple[tuple, dict | None]]
+
+
+_ENTITY_CACHE_LOCK = threading.Lock()
+_SESSIONS_CACHE: dict[Path, EntityCache] = {}
+_JOBS_CACHE: dict[Path, EntityCache] = {}
+
+
+def _stat_key(path: str | Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _entity_dir_key(entity_dir: Path, filenames: tuple[str, ...], labels_dir: Path) -> tuple:
+    """
+    Fingerprint of every file load_sessions/load_jobs reads for one run.
+
+    The harness rewrites meta.json/status.json in place, which does not bump
+    the parent directory mtime, so each metadata file's stat is part of the key.
+    """
+    # DirEntry.is_dir answers from the readdir d_type; joining onto entry.path
+    # avoids building a Path per metadata file.
+    with os.scandir(entity_dir) as it:
+        entries = [
+            (entry.name, *(_stat_key(f"{entry.path}/{name}") for name in filenames)) for entry in it if entry.is_dir()
+        ]
+    entries.sort()
+    return _stat_key(entity_dir), _stat_key(labels_dir), tuple(entries)
+
+
+def _cached_entity(cache: dict, entity_dir: Path) -> EntityCache:
+    with _ENTITY_CACHE_LOCK:
+        return cache.get(entity_dir) or EntityCache(None, [], {})
+
+
+def _parse_entities(entity_dir: Path, key: tuple, filenames: tuple[str, ...], cached: EntityCache, build) -> dict:
+    """Parse each entry's metadata, reusing the previous payload for entries whose files did not change."""
+    parsed: dict[str, tuple[tuple, dict | None]] = {}
+    stale = []
+    for name, *stats in key[2]:
+        stats = tuple(stats)
+        previous = cached.parsed.get(name)
+        if previous is not None and previous[0] == stats:
+            parsed[name] = previous
+        else:
+            stale.append((name, stats))
+    paths = [entity_dir / name / filename for name, _ in stale for filename in filenames]
+    payloads = iter(_IO_POOL.map(read_json, paths))
+    for name, stats in stale:
+        parsed[name] = (stats, build(name, *(next(payloads) for _ in filenames)))
+    return parsed
+
+
+def _store_entities(cache: dict, entity_dir: Path, entry: EntityCache) -> list[dict]:
+    with _ENTITY_CACHE_LOCK:
+        cache[entity_dir] = entry
+    return list(entry.items)
+
+
+def invalidate_entity_caches(entity_dir: Path) -> None:
+    # Only labels changed: drop the assembled lists but keep parsed metadata.
+    with _ENTITY_CACHE_LOCK:
+        for cache in (_SESSIONS_CACHE, _JOBS_CACHE):
+            cached = cache.get(entity_dir)
+            if cached is not None:
+                cache[entity_dir] = cached._replace(key=None)
+
+
+def _session_meta(name: str, meta: dict | None) -> dict | None:
+    if not meta:
+        return None
+    meta["session_id"] = meta.get("session_id") or name
+    return meta
+
+
+def _job_payload(name: str, input_data: dict | None, status_data: dict | None) -> dict:
+    input_data = input_data or {}
+    status_data = status_data or {}
+    job_id = input_data.get("job_id") or status_data.get("job_id") or name
+    payload = {**input_data, **status_data}
+    payload["job_id"] = job_id
+    return payload
+
+
+def _apply_labels(items: list[dict], labels_dir: Path, id_field: str) -> list[dict]:
+    labels = _IO_POOL.map(load_label, [labels_dir / f"{item[id_field]}.json" for item in items])
+    labelled = []
+    for item, label in zip(items, labels):
+        # Cached payloads are shared across loads, so labels go on a copy.
+        labelled.append({**item, "name": label["name"]} if label else item)
+    return labelled
 
 
 def load_sessions(run_id: str) -> list[dict]:
@@ -172,22 +396,14 @@ def load_sessions(run_id: str) -> list[dict]:
     labels_dir = session_labels_dir_for_run(run_id)
     if not sessions_dir.exists():
         return []
-    sessions = []
-    for entry in sessions_dir.iterdir():
-        if not entry.is_dir():
-            continue
-        meta_path = entry / "meta.json"
-        meta = read_json(meta_path)
-        if not meta:
-            continue
-        session_id = meta.get("session_id") or entry.name
-        meta["session_id"] = session_id
-        label = load_label(labels_dir / f"{session_id}.json")
-        if label:
-            meta["name"] = label["name"]
-        sessions.append(meta)
+    key = _entity_dir_key(sessions_dir, ("meta.json",), labels_dir)
+    cached = _cached_entity(_SESSIONS_CACHE, sessions_dir)
+    if cached.key == key:
+        return list(cached.items)
+    parsed = _parse_entities(sessions_dir, key, ("meta.json",), cached, _session_meta)
+    sessions = _apply_labels([meta for _, meta in parsed.values() if meta], labels_dir, "session_id")
     sessions.sort(key=lambda item: str(item.get("started_at") or ""))
-    return sessions
+    return _store_entities(_SESSIONS_CACHE, sessions_dir, EntityCache(key, sessions, parsed))
 
 
 def load_jobs(run_id: str) -> list[dict]:
@@ -195,33 +411,246 @@ def load_jobs(run_id: str) -> list[dict]:
     labels_dir = job_labels_dir_for_run(run_id)
     if not jobs_dir.exists():
         return []
-    jobs = []
-    for entry in jobs_dir.iterdir():
-        if not entry.is_dir():
-            continue
-        input_path = entry / "input.json"
-        status_path = entry / "status.json"
-        input_data = read_json(input_path) or {}
-        status_data = read_json(status_path) or {}
-        job_id = input_data.get("job_id") or status_data.get("job_id") or entry.name
-        payload = {**input_data, **status_data}
-        payload["job_id"] = job_id
-        label = load_label(labels_dir / f"{job_id}.json")
-        if label:
-            payload["name"] = label["name"]
-        jobs.append(payload)
+    key = _entity_dir_key(jobs_dir, ("input.json", "status.json"), labels_dir)
+    cached = _cached_entity(_JOBS_CACHE, jobs_dir)
+    if cached.key == key:
+        return list(cached.items)
+    parsed = _parse_entities(jobs_dir, key, ("input.json", "status.json"), cached, _job_payload)
+    jobs = _apply_labels([payload for _, payload in parsed.values()], labels_dir, "job_id")
     jobs.sort(key=lambda item: str(item.get("started_at") or item.get("submitted_at") or ""))
-    return jobs
+    return _store_entities(_JOBS_CACHE, jobs_dir, EntityCache(key, jobs, parsed))
+
+
+INTERNED_FIELDS = ("session_id", "job_id", "source", "event_type")
+# Bytes of complete JSONL lines decoded per json_loads call when filling the timeline cache.
+TIMELINE_BATCH_BYTES = 4 * 1024 * 1024
+
+
+class TimelineCache:
+    """
+    Parsed rows of one `filtered_timeline.jsonl`, extended as the file grows.
+
+    The merge step rewrites the whole file each cycle, so the already-parsed
+    prefix is only reused while its CRC still matches the bytes on disk; any
+    other change (new inode, shrink, edited prefix) re-parses from the start.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.ino: int | None = None
+        self.size = -1
+        self.mtime_ns = -1
+        self.offset = 0
+        self.crc = 0
+        self.rows: list[dict] = []
+        # Prefix-parallel to `rows`, filled lazily by timestamps(); kept out of
+        # the row dicts so responses are unchanged.
+        self.ts_ns: list[int | None] = []
+        self.counts_by_type: Counter = Counter()
+        # Row positions per session/job so entity-scoped queries skip unrelated rows;
+        # packed int64 arrays take 8 bytes per row instead of a list slot plus an int object.
+        self.by_session: dict[str, array] = {}
+        self.by_job: dict[str, array] = {}
+        # Columns parallel to `rows` (non-str values stored as None) so source and
+        # event_type filters run as C-level map/compress passes.
+        self.source_values: list[str | None] = []
+        self.event_type_values: list[str | None] = []
+        # `event_type or "unknown"` per row, the key counts are reported under.
+        self.type_keys: list[str] = []
+
+    def refresh(self, path: Path) -> None:
+        try:
+            # Unchanged file (the common polling case) costs a single stat.
+            st = os.stat(path)
+            if (st.st_ino, st.st_size, st.st_mtime_ns) == (self.ino, self.size, self.mtime_ns):
+                return
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            self.reset()
+            return
+        try:
+            st = os.fstat(fd)
+            if st.st_ino != self.ino or st.st_size < self.offset:
+                self.reset()
+            # pread rather than mmap: the merge step truncates and rewrites this file
+            # in place, and touching a mapped page past the new end raises SIGBUS.
+            # A truncated read here only yields short data, caught by the checks below.
+            if self.offset and self._prefix_crc(fd) != self.crc:
+                self.reset()
+            self._consume(fd, st.st_size)
+            self.ino, self.size, self.mtime_ns = st.st_ino, st.st_size, st.st_mtime_ns
+        finally:
+            os.close(fd)
+
+    def _prefix_crc(self, fd: int) -> int:
+        crc = pos = 0
+        while pos < self.offset:
+            chunk = os.pread(fd, min(TIMELINE_BATCH_BYTES, self.offset - pos), pos)
+            if not chunk:
+                # File shrank under us; CRC32 is never negative, so this forces a re-parse.
+                return -1
+            crc = zlib.crc32(chunk, crc)
+            pos += len(chunk)
+        return crc
+
+    def _consume(self, fd: int, size: int) -> None:
+        pos = read_pos = self.offset
+        pending = b""
+        while read_pos < size:
+            # Complete lines up to ~TIMELINE_BATCH_BYTES at a time (at least one line).
+            chunk = os.pread(fd, min(TIMELINE_BATCH_BYTES, size - read_pos), read_pos)
+            if not chunk:
+                # Truncated since fstat: stop here; the next refresh sees the new size.
+                break
+            read_pos += len(chunk)
+            buf = pending + chunk if pending else chunk
+            last = buf.rfind(b"\n")
+            if last == -1:
+                pending = buf
+                continue
+            self._parse_block(buf[:last])
+            self.crc = zlib.crc32(memoryview(buf)[: last + 1], self.crc)
+            pos += last + 1
+            pending = buf[last + 1 :]
+        if pending and read_pos == size:
+            # Trailing line without a newline: keep it only once it parses,
+            # otherwise the writer is mid-line and we retry on the next refresh.
+            if self._parse(pending) is not None or pending.isspace():
+                self.crc = zlib.crc32(pending, self.crc)
+                pos += len(pending)
+        self.offset = pos
+
+    def _parse_block(self, block: bytes) -> None:
+        """Parse newline-separated rows with one decoder call, falling back per line."""
+        try:
+            events = json_loads(b"[" + block.replace(b"\n", b",") + b"]", errors="replace")
+        except ValueError:
+            events = None
+        # A blank or malformed line either breaks the array or changes the element count.
+        if events is None or len(events) != block.count(b"\n") + 1:
+            for line in block.split(b"\n"):
+                if line:
+                    self._parse(line)
+            return
+        for event in events:
+            if isinstance(event, dict):
+                self._add(event)
+
+    def _parse(self, line: bytes) -> dict | None:
+        try:
+            event = json_loads(line, errors="replace")
+        except ValueError:
+            return None
+        if not isinstance(event, dict):
+            return None
+        self._add(event)
+        return event
+
+    def _add(self, event: dict) -> None:
+        # Filtered fields repeat across most rows: interning shares one string
+        # per distinct value and lets filter comparisons short-circuit on identity.
+        for field in INTERNED_FIELDS:
+            value = event.get(field)
+            if type(value) is str:
+                event[field] = sys.intern(value)
+        index = len(self.rows)
+        self.rows.append(event)
+        for field, index_by in (("session_id", self.by_session), ("job_id", self.by_job)):
+            value = event.get(field)
+            if type(value) is str:
+                positions = index_by.get(value)
+                if positions is None:
+                    positions = index_by[value] = array("q")
+                positions.append(index)
+        source = event.get("source")
+        self.source_values.append(source if type(source) is str else None)
+        event_type = event.get("event_type")
+        self.event_type_values.append(event_type if type(event_type) is str else None)
+        type_key = event_type or "unknown"
+        self.type_keys.append(type_key)
+        self.counts_by_type[type_key] += 1
+
+    def timestamps(self) -> list[int | None]:
+        """Nanosecond `ts` for every row, converted only once a time-range query needs them."""
+        ts_ns = self.ts_ns
+        for event in islice(self.rows, len(ts_ns), None):
+            ts = event.get("ts")
+            ts_ns.append(timestamp_ns(ts) if isinstance(ts, str) else None)
+        return ts_ns
+
+
+# Parsed timelines kept resident per process, least recently used evicted first.
+# The active run is polled constantly, so it stays; a couple of browsed runs join it.
+TIMELINE_CACHE_RUNS = 3
+_TIMELINE_CACHES: dict[Path, TimelineCache] = {}
+_TIMELINE_CACHES_LOCK = threading.Lock()
+
+
+def timeline_cache_for(path: Path) -> TimelineCache:
+    with _TIMELINE_CACHES_LOCK:
+        # Re-inserting moves the path to the most recently used end of the dict.
+        cache = _TIMELINE_CACHES.pop(path, None)
+        if cache is None:
+            cache = TimelineCache()
+            while len(_TIMELINE_CACHES) >= TIMELINE_CACHE_RUNS:
+                # Requests still holding an evicted cache finish with it; nothing else does.
+                del _TIMELINE_CACHES[next(iter(_TIMELINE_CACHES))]
+        _TIMELINE_CACHES[path] = cache
+        return cache
+
+
+def timeline_row_predicate(
+    start: int | None, end: int | None, checks: list[tuple[str, str | frozenset[str]]]
+) -> Callable[[dict, int | None], bool] | None:
+    """
+    Build one `(event, ts_ns) -> bool` test covering only the filters in use.
+
+    `checks` pairs a row field with a required value (str) or allowed set;
+    returns None when nothing needs testing so the caller can skip the call.
+    """
+    tests: list[Callable[[dict, int | None], bool]] = []
+    if start is not None and end is not None:
+        tests.append(lambda event, ts: ts is not None and start <= ts <= end)
+    elif start is not None:
+        tests.append(lambda event, ts: ts is not None and ts >= start)
+    elif end is not None:
+        tests.append(lambda event, ts: ts is not None and ts <= end)
+    for field, allowed in checks:
+        if isinstance(allowed, str):
+            tests.append(lambda event, ts, field=field, value=allowed: event.get(field) == value)
+        else:
+            tests.append(lambda event, ts, field=field, allowed=allowed: event.get(field) in allowed)
+    if not tests:
+        return None
+    if len(tests) == 1:
+        return tests[0]
+    if len(tests) == 2:
+        first, second = tests
+        return lambda event, ts: first(event, ts) and second(event, ts)
+    return lambda event, ts: all(test(event, ts) for test in tests)
+
 
+def iter_timeline_rows(filters: dict, only_counts: bool = False) -> tuple[list[dict], dict, str | None]:
+    """
+    Return `(rows, counts_by_event_type, run_id)` for a timeline query.
 
-def iter_timeline_rows(filters: dict) -> tuple[list[dict], dict, str | None]:
+    With `only_counts` the matching rows are counted but not collected and
+    `rows` is empty; counts never depend on `limit`.
+    """
     run_id = resolve_run_id(filters)
-    start = normalize_ts(filters.get("start", [None])[0])
-    end = normalize_ts(filters.get("end", [None])[0])
+    start_raw = filters.get("start", [None])[0]
+    end_raw = filters.get("end", [None])[0]
+    start = timestamp_ns(start_raw)
+    end = timestamp_ns(end_raw)
     limit_raw = filters.get("limit", [None])[0]
     limit = int(limit_raw) if limit_raw and limit_raw.isdigit() else None
     session_id = filters.get("session_id", [None])[0]
+    session_id = sys.intern(session_id) if session_id else session_id
     job_id = filters.get("job_id", [None])[0]
+    job_id = sys.intern(job_id) if job_id else job_id
     sources = parse_csv(filters.get("source", []))
     event_types = parse_csv(filters.get("event_type", []))
 
@@ -230,39 +659,268 @@ def iter_timeline_rows(filters: dict) -> tuple[list[dict], dict, str | None]:
 
     if run_id is None:
         return rows, counts, None
+    if (start_raw and start is None) or (end_raw and end is None):
+        # An unparseable bound cannot match any row.
+        return rows, counts, run_id
 
     timeline_path = timeline_path_for_run(run_id)
-    if not timeline_path.exists():
+    cache = timeline_cache_for(timeline_path)
+    with cache.lock:
+        cache.refresh(timeline_path)
+        events = cache.rows
+        ts_keys = cache.timestamps() if start is not None or end is not None else None
+        total = len(events)
+        if not (start_raw or end_raw or session_id or job_id or sources or event_types):
+            counts = dict(cache.counts_by_type)
+            if only_counts:
+                return rows, counts, run_id
+            rows = events[total - limit :] if limit and limit < total else events[:total]
+            return rows, counts, run_id
+        candidates: Sequence[int] | None = None
+        indexed_field = None
+        for field, entity_id, index in (("session_id", session_id, cache.by_session), ("job_id", job_id, cache.by_job)):
+            if entity_id:
+                positions = index.get(entity_id, ())
+                if candidates is None or len(positions) < len(candidates):
+                    candidates, indexed_field = positions, field
+        if candidates is not None:
+            # Snapshot the length: the lists keep growing after the lock is released.
+            candidates = candidates[:]
+        columns = ((cache.source_values, sources), (cache.event_type_values, event_types))
+        type_keys = cache.type_keys
+
+    # Narrow positions column by column; map/compress keep the per-row work in C.
+    for column, allowed in columns:
+        if not allowed:
+            continue
+        if candidates is None:
+            candidates = list(compress(range(total), map(allowed.__contains__, islice(column, total))))
+        else:
+            candidates = list(compress(candidates, map(allowed.__contains__, map(column.__getitem__, candidates))))
+
+    checks = [
+        (field, allowed)
+        for field, allowed in (("session_id", session_id), ("job_id", job_id))
+        # The index already guarantees equality on the field it was chosen for.
+        if allowed and field != indexed_field
+    ]
+    predicate = timeline_row_predicate(start, end, checks)
+    if predicate is None and candidates is not None:
+        # Index/column-only query: every candidate matches, so the limit is a slice.
+        picked = candidates[-limit:] if limit else candidates
+        counts = dict(Counter(map(type_keys.__getitem__, candidates)))
+        return ([] if only_counts else list(map(events.__getitem__, picked))), counts, run_id
+    if ts_keys is None:
+        rows_in_scope = islice(events, total) if candidates is None else (events[i] for i in candidates)
+        scanned = zip(rows_in_scope, repeat(None))
+    elif candidates is None:
+        scanned = zip(islice(events, total), ts_keys)
+    else:
+        scanned = ((events[i], ts_keys[i]) for i in candidates)
+    if only_counts:
+        counts = dict(
+            Counter(
+                event.get("event_type") or "unknown"
+                for event, ts in scanned
+                if predicate is None or predicate(event, ts)
+            )
+        )
         return rows, counts, run_id
+    # deque(maxlen=...) evicts the oldest match in O(1) when a limit is set; maxlen
+    # must fit a C ssize_t, and no more than `total` rows can match anyway.
+    matched: deque | list = deque(maxlen=min(limit, total)) if limit else []
+    append = matched.append
+    matched_types: list[str] = []
+    append_type = matched_types.append
+    for event, ts in scanned:
+        if predicate is None or predicate(event, ts):
+            append(event)
+            append_type(event.get("event_type") or "unknown")
+    counts = dict(Counter(matched_types))
+    return (list(matched) if limit else matched), counts, run_id
+
+
+STREAM_SLAB_BYTES = 64 * 1024
+# Rows serialized per json_dumps_bytes call; one C-level call per batch instead of per row.
+STREAM_BATCH_ROWS = 256
+
+
+def iter_timeline_body(run_id: str | None, rows: list[dict]) -> Iterator[bytes]:
+    """Serialize a `/api/timeline` body in ~64 KiB slabs instead of one large buffer."""
+    yield b'{"run_id":' + json_dumps_bytes(run_id) + b',"rows":['
+    slab = bytearray()
+    for start in range(0, len(rows), STREAM_BATCH_ROWS):
+        if start:
+            slab += b","
+        # Strip the enclosing brackets so batches concatenate into one array.
+        slab += json_dumps_bytes(rows[start : start + STREAM_BATCH_ROWS])[1:-1]
+        if len(slab) >= STREAM_SLAB_BYTES:
+            yield bytes(slab)
+            slab.clear()
+    slab += b'],"count":%d}' % len(rows)
+    yield bytes(slab)
+
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+# Larger files are not kept in memory; their identity body goes out via sendfile.
+SENDFILE_MIN_BYTES = 64 * 1024
+
+
+class StaticFile(NamedTuple):
+    mtime_ns: int
+    size: int
+    payload: bytes | None
+    content_type: str
+    etag: str
+    gzipped: bytes | None
+
+
+def build_file_path(request_path: str) -> Path | None:
+    """
+    Resolve a request path to a file path under BUILD_DIR.
+
+    Returns None when `..` segments or symlinks lead outside the build, so
+    nothing else is ever read or cached; resolving also gives every spelling
+    of the same file a single `_STATIC_CACHE` key.
+    """
+    if request_path == "/":
+        request_path = "/index.html"
+    build_root = BUILD_DIR.resolve()
+    target = (build_root / request_path.lstrip("/")).resolve()
+    return target if target.is_relative_to(build_root) else None
+
+
+# Keyed on resolved paths from build_file_path, so it holds at most one entry per build file.
+_STATIC_CACHE: dict[Path, StaticFile] = {}
+_STATIC_CACHE_LOCK = threading.Lock()
+
+
+def load_static(path: Path) -> StaticFile | None:
+    """
+    Return a build file with its content type, ETag, and gzip variant, re-reading only on change.
+
+    Returns None when `path` is not a regular file; a cache hit costs one stat.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not S_ISREG(st.st_mode):
+        return None
+    mtime_ns = st.st_mtime_ns
+    with _STATIC_CACHE_LOCK:
+        cached = _STATIC_CACHE.get(path)
+    if cached is not None and (cached.mtime_ns, cached.size) == (mtime_ns, st.st_size):
+        return cached
+    try:
+        payload = path.read_bytes()
+    except OSError:
+        return None
+    content_type = CONTENT_TYPES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0]
+    content_type = content_type or "application/octet-stream"
+    etag = f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+    gzipped = None
+    if len(payload) >= GZIP_MIN_BYTES and content_type.startswith(COMPRESSIBLE_TYPES):
+        gzipped = gzip.compress(payload, compresslevel=GZIP_LEVEL)
+    size = len(payload)
+    entry = StaticFile(mtime_ns, size, payload if size < SENDFILE_MIN_BYTES else None, content_type, etag, gzipped)
+    with _STATIC_CACHE_LOCK:
+        _STATIC_CACHE[path] = entry
+    return entry
+
+
+def _coding_q(accept_encoding: str | None, coding: str, wildcard: bool = True) -> float:
+    """q-value `Accept-Encoding` gives `coding`; an explicit entry wins over `*`."""
+    fallback = 0.0
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if name != coding and not (wildcard and name == "*"):
+            continue
+        params = params.strip().lower()
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 0.0
+        if name == coding:
+            return q
+        fallback = q
+    return fallback
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    return _coding_q(accept_encoding, "gzip") > 0
 
-    with timeline_path.open("r", encoding="utf-8", errors="replace") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            ts = normalize_ts(event.get("ts"))
-            if start and (ts is None or ts < start):
-                continue
-            if end and (ts is None or ts > end):
-                continue
-            if session_id and event.get("session_id") != session_id:
-                continue
-            if job_id and event.get("job_id") != job_id:
-                continue
-            if sources and event.get("source") not in sources:
-                continue
-            if event_types and event.get("event_type") not in event_types:
-                continue
-            rows.append(event)
-            event_type = event.get("event_type") or "unknown"
-            counts[event_type] = counts.get(event_type, 0) + 1
-            if limit and len(rows) > limit:
-                rows.pop(0)
-    return rows, counts, run_id
+
+def response_encoding(accept_encoding: str | None) -> str | None:
+    """Pick `zstd` or `gzip` for a dynamic response, preferring zstd on equal q."""
+    gzip_q = _coding_q(accept_encoding, "gzip")
+    # zstd only when named explicitly: `*` predates it in many clients.
+    zstd_q = _coding_q(accept_encoding, "zstd", wildcard=False) if zstandard is not None else 0.0
+    if zstd_q > 0 and zstd_q >= gzip_q:
+        return "zstd"
+    return "gzip" if gzip_q > 0 else None
+
+
+_ZSTD_LOCAL = threading.local()
+
+
+def _zstd_compressor():
+    # ZstdCompressor instances are not thread-safe, so each handler thread keeps one.
+    compressor = getattr(_ZSTD_LOCAL, "compressor", None)
+    if compressor is None:
+        compressor = _ZSTD_LOCAL.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return _zstd_compressor().compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _compress_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    if encoding == "zstd":
+        compressor = _zstd_compressor().compressobj()
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk)
+    yield compressor.flush()
+
+
+def quick_qs(query: str) -> dict[str, list[str]]:
+    """`parse_qs` equivalent (blank values dropped) that skips work for empty queries.
+
+    Parts without `%` or `+` (run/session/job ids, plain limits) are taken as-is
+    instead of going through `unquote_plus`.
+    """
+    if not query:
+        return {}
+    params: dict[str, list[str]] = {}
+    for part in query.split("&"):
+        key, sep, value = part.partition("=")
+        if not sep or not value:
+            continue
+        if "%" in part or "+" in part:
+            key = unquote_plus(key)
+            value = unquote_plus(value)
+        values = params.get(key)
+        if values is None:
+            params[key] = [value]
+        else:
+            values.append(value)
+    return params
 
 
 def resolve_run_id_with_error(filters: dict) -> tuple[str | None, str | None]:
@@ -302,12 +960,12 @@ def _parse_http_response(raw: bytes) -> tuple[int, dict[str, str], bytes]:
 
 def runtime_request(method: str, path: str, headers: dict | None = None, body: bytes | None = None) -> tuple[int, dict[str, str], bytes]:
     if not RUNTIME_SOCKET_PATH.exists():
-        return 503, {"content-type": "application/json"}, json.dumps(
+        return 503, {"content-type": "application/json"}, json_dumps_bytes(
             {
                 "error": "runtime control-plane unavailable",
                 "socket_path": str(RUNTIME_SOCKET_PATH),
             }
-        ).encode("utf-8")
+        )
 
     request_headers = {"Host": "lux-runtime", "Connection": "close"}
     if headers:
@@ -339,15 +997,55 @@ def runtime_request(method: str, path: str, headers: dict | None = None, body: b
     return _parse_http_response(b"".join(chunks))
 
 
+# PATCH bodies this large are not worth draining to keep a connection alive.
+MAX_DRAIN_BYTES = 1024 * 1024
+
+
 class UIHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps browser connections open across the UI's polling requests;
+    # every response is framed by Content-Length or chunked encoding.
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections release their handler thread after this long.
+    timeout = 60
+
     def _json(self, payload: dict, status: int = 200) -> None:
-        body = json.dumps(payload).encode("utf-8")
+        body = json_dumps_bytes(payload)
+        encoding = response_encoding(self.headers.get("Accept-Encoding")) if len(body) >= GZIP_MIN_BYTES else None
+        if encoding:
+            body = compress_body(body, encoding)
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
         self.end_headers()
         self.wfile.write(body)
 
+    def _stream(self, chunks: Iterable[bytes], status: int = 200, content_type: str = "application/json") -> None:
+        """Write a body of unknown length: chunked on HTTP/1.1, close-delimited otherwise."""
+        chunked = self.protocol_version == "HTTP/1.1" and self.request_version == "HTTP/1.1"
+        encoding = response_encoding(self.headers.get("Accept-Encoding"))
+        if encoding:
+            chunks = _compress_chunks(chunks, encoding)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        write = self.wfile.write
+        for chunk in chunks:
+            if not chunk:
+                continue
+            write(b"%x\r\n%b\r\n" % (len(chunk), chunk) if chunked else chunk)
+        if chunked:
+            write(b"0\r\n\r\n")
+
     def _bytes(self, payload: bytes, status: int = 200, content_type: str = "application/octet-stream") -> None:
         self.send_response(status)
         self.send_header("Content-Type", content_type)
@@ -355,44 +1053,84 @@ class UIHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(payload)
 
-    def _send_file(self, path: Path) -> None:
-        content_type, _ = mimetypes.guess_type(path.name)
-        payload = path.read_bytes()
-        self._bytes(payload, 200, content_type or "application/octet-stream")
-
-    def _resolve_static(self, request_path: str) -> Path | None:
-        if request_path in ("/", "/index.html"):
-            target = BUILD_DIR / "index.html"
-            return target if target.exists() else None
-        target = BUILD_DIR / request_path.lstrip("/")
-        if target.exists() and target.is_file():
-            return target
-        return None
+    def _send_file(self, path: Path, static: StaticFile) -> None:
+        payload, size, etag = static.payload, static.size, static.etag
+        gzipped = static.gzipped is not None and accepts_gzip(self.headers.get("Accept-Encoding"))
+        if gzipped:
+            # Distinct validator per representation so caches never mix them up.
+            payload, etag = static.gzipped, static.etag[:-1] + '-gz"'
+            size = len(payload)
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", static.content_type)
+        self.send_header("Content-Length", str(size))
+        self.send_header("ETag", etag)
+        if static.gzipped is not None:
+            self.send_header("Vary", "Accept-Encoding")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if payload is not None:
+            self.wfile.write(payload)
+            return
+        self.wfile.flush()
+        # socket.sendfile uses os.sendfile and falls back to send() where unsupported.
+        with path.open("rb") as handle:
+            sent = self.connection.sendfile(handle, 0, size)
+        if sent < size:
+            # File shrank after it was cached; the advertised length can't be honored.
+            self.close_connection = True
+
+    def _resolve_static(self, target: Path | None) -> tuple[Path, StaticFile] | None:
+        static = load_static(target) if target is not None else None
+        return (target, static) if static is not None else None
 
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
         if parsed.path.startswith("/api/"):
             return self.handle_api(parsed)
 
-        target = self._resolve_static(parsed.path)
-        if target:
-            return self._send_file(target)
-
-        index_path = BUILD_DIR / "index.html"
-        if index_path.exists():
-            return self._send_file(index_path)
+        target = build_file_path(parsed.path)
+        if target is None:
+            return self._bytes(b"Not found", 404, "text/plain")
+        # Unknown routes fall back to index.html for client-side routing.
+        resolved = self._resolve_static(target) or self._resolve_static(build_file_path("/index.html"))
+        if resolved:
+            return self._send_file(*resolved)
         return self._bytes(b"Not found", 404, "text/plain")
 
     def do_PATCH(self) -> None:
+        self._body_read = False
         parsed = urlparse(self.path)
-        if not parsed.path.startswith("/api/"):
-            return self._json({"error": "not found"}, 404)
-        return self.handle_api_patch(parsed)
+        try:
+            if not parsed.path.startswith("/api/"):
+                return self._json({"error": "not found"}, 404)
+            return self.handle_api_patch(parsed)
+        finally:
+            if not self._body_read:
+                self._discard_body()
+
+    def _discard_body(self) -> None:
+        """Consume an unread request body so the next request on this connection parses cleanly."""
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            length = -1
+        if 0 <= length <= MAX_DRAIN_BYTES:
+            self.rfile.read(length)
+        else:
+            self.close_connection = True
 
     def handle_api(self, parsed) -> None:
-        filters = parse_qs(parsed.query)
         if parsed.path.startswith("/api/runtime/"):
             return self.handle_runtime_api(parsed)
+        if parsed.path == "/api/runs":
+            return self._json({"runs": list_run_ids(), "active_run_id": load_active_run_id()})
+        filters = quick_qs(parsed.query)
         if parsed.path == "/api/sessions":
             run_id, run_err = resolve_run_id_with_error(filters)
             if run_err:
@@ -405,8 +1143,6 @@ class UIHandler(BaseHTTPRequestHandler):
                 return self._json({"error": run_err}, 400 if run_err == "invalid run_id" else 404)
             jobs = load_jobs(run_id) if run_id else []
             return self._json({"run_id": run_id, "jobs": jobs})
-        if parsed.path == "/api/runs":
-            return self._json({"runs": list_run_ids(), "active_run_id": load_active_run_id()})
         if parsed.path == "/api/timeline":
             run_id, run_err = resolve_run_id_with_error(filters)
             if run_err:
@@ -414,14 +1150,14 @@ class UIHandler(BaseHTTPRequestHandler):
             if run_id and not filters.get("run_id"):
                 filters["run_id"] = [run_id]
             rows, _, resolved_run_id = iter_timeline_rows(filters)
-            return self._json({"run_id": resolved_run_id, "rows": rows, "count": len(rows)})
+            return self._stream(iter_timeline_body(resolved_run_id, rows))
         if parsed.path == "/api/summary":
             run_id, run_err = resolve_run_id_with_error(filters)
             if run_err:
                 return self._json({"error": run_err}, 400 if run_err == "invalid run_id" else 404)
             if run_id and not filters.get("run_id"):
                 filters["run_id"] = [run_id]
-            _, counts, resolved_run_id = iter_timeline_rows(filters)
+            _, counts, resolved_run_id = iter_timeline_rows(filters, only_counts=True)
             total = sum(counts.values())
             return self._json({"run_id": resolved_run_id, "counts": counts, "total": total})
         return self._json({"error": "not found"}, 404)
@@ -503,6 +1239,7 @@ class UIHandler(BaseHTTPRequestHandler):
             self.send_response(status)
             self.send_header("Content-Type", headers.get("content-type", "text/event-stream"))
             self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
             self.end_headers()
             if body:
                 self.wfile.write(body)
@@ -529,7 +1266,7 @@ class UIHandler(BaseHTTPRequestHandler):
             sock.close()
 
     def handle_api_patch(self, parsed) -> None:
-        filters = parse_qs(parsed.query)
+        filters = quick_qs(parsed.query)
         run_id, run_err = resolve_run_id_with_error(filters)
         if run_err:
             return self._json({"error": run_err}, 400 if run_err == "invalid run_id" else 404)
@@ -561,9 +1298,10 @@ class UIHandler(BaseHTTPRequestHandler):
             return None, "invalid content length"
         if length <= 0:
             return None, "invalid json"
+        self._body_read = True
         try:
-            payload = json.loads(self.rfile.read(length))
-        except json.JSONDecodeError:
+            payload = json_loads(self.rfile.read(length))
+        except ValueError:
             return None, "invalid json"
         if not isinstance(payload, dict):
             return None, "invalid json"
@@ -587,6 +1325,7 @@ class UIHandler(BaseHTTPRequestHandler):
             return self._json({"error": "name is required"}, 400)
 
         label = write_label(label_dir, entity_id, name)
+        invalidate_entity_caches(entity_dir)
         return self._json(
             {
                 "run_id": run_id,
@@ -600,11 +1339,72 @@ class UIHandler(BaseHTTPRequestHandler):
         return
 
 
+def _raise_system_exit(signum, frame) -> None:
+    raise SystemExit(0)
+
+
+# A worker that dies sooner than this after starting is restarted only after
+# the same delay, so a worker that crashes on startup cannot spin the parent.
+WORKER_RESTART_DELAY_SECONDS = 1.0
+
+
+def _fork_worker(server: ThreadingHTTPServer) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            server.serve_forever()
+        finally:
+            os._exit(0)
+    return pid
+
+
+def serve_prefork(server: ThreadingHTTPServer, workers: int) -> None:
+    """
+    Serve from `workers` forked processes that share the server's listening socket.
+
+    Timeline filtering is pure-Python CPU work, so one process serializes
+    concurrent clients on its GIL; each worker keeps its own caches. Workers
+    only exit when killed, so any worker exit is replaced with a fresh fork.
+    """
+    children: dict[int, float] = {}
+    for _ in range(workers):
+        children[_fork_worker(server)] = time.monotonic()
+    signal.signal(signal.SIGTERM, _raise_system_exit)
+    try:
+        while True:
+            pid, status = os.wait()
+            started = children.pop(pid, None)
+            if started is None:
+                continue
+            print(
+                f"ui worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting",
+                file=sys.stderr,
+                flush=True,
+            )
+            if time.monotonic() - started < WORKER_RESTART_DELAY_SECONDS:
+                time.sleep(WORKER_RESTART_DELAY_SECONDS)
+            children[_fork_worker(server)] = time.monotonic()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        server.server_close()
+
+
 def main() -> None:
     bind = os.getenv("UI_BIND", "0.0.0.0")
     port = int(os.getenv("UI_PORT", "8090"))
+    workers = max(1, int(os.getenv("UI_WORKERS", "1")))
     server = ThreadingHTTPServer((bind, port), UIHandler)
-    print(f"ui server listening on {bind}:{port}")
+    print(f"ui server listening on {bind}:{port} ({workers} worker{'s' if workers > 1 else ''})", flush=True)
+    if workers > 1:
+        serve_prefork(server, workers)
+        return
     server.serve_forever()
 
 